@@ -35,9 +35,9 @@ def main():
             print(f"\n{'='*60}")
             print(f"🚀 Starting production server with Waitress")
             print(f"{'='*60}")
-            print(f"Server running at: http://{config.host}:{config.port}")
+            print(f"Server running at: http://{config.host}:{config.port} ({config.server_threads} threads)")
             print(f"Press CTRL+C to stop\n")
-            serve(app, host=config.host, port=config.port, threads=4)
+            serve(app, host=config.host, port=config.port, threads=config.server_threads)
         except ImportError:
             print("\n❌ ERROR: Waitress is not installed!")
             print("Production mode requires Waitress WSGI server.")
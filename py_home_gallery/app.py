@@ -10,9 +10,16 @@ from py_home_gallery.routes import register_routes
 from py_home_gallery.workers.thumbnail_worker import shutdown_thumbnail_worker
 from py_home_gallery.workers.preload import preload_all
 from py_home_gallery.utils.cache import setup_caches
+from py_home_gallery.utils.probe_cache import setup_probe_cache, shutdown_probe_cache
+from py_home_gallery.media.scanner import configure_scanner
+from py_home_gallery.media.dimension_helper import configure_dimension_reads, shutdown_dimension_reads
 from py_home_gallery.utils.logger import configure_logging
+from py_home_gallery.utils.ffmpeg import configure_ffmpeg
+from py_home_gallery.media.thumbnails import configure_thumbnails
+from py_home_gallery.utils.thumbnail_optimizer import setup_thumbnail_optimizer, shutdown_thumbnail_optimizer
 from py_home_gallery.utils.content import get_content_manager
-from py_home_gallery.constants import METADATA_CACHE_MULTIPLIER
+from py_home_gallery.utils.json_provider import configure_json
+from py_home_gallery.constants import METADATA_CACHE_MULTIPLIER, PROBE_CACHE_FILENAME
 import os
 import atexit
 
@@ -33,6 +40,9 @@ def create_app(config):
                 template_folder="../templates",
                 static_folder=static_folder_path,
                 static_url_path='/static')
+
+    # Use the fastest available JSON encoder for API responses
+    configure_json(app)
     
     # Store configuration in app config
     app.config['MEDIA_ROOT'] = config.media_dir
@@ -40,10 +50,17 @@ def create_app(config):
     app.config['ITEMS_PER_PAGE'] = config.items_per_page
     app.config['PLACEHOLDER_URL'] = config.placeholder_url
     app.config['SERVE_MEDIA'] = config.serve_media
+    # Let the front-end server send file bodies (send_file emits X-Sendfile)
+    app.config['USE_X_SENDFILE'] = config.x_sendfile
+    # Let Nginx send file bodies through X-Accel-Redirect (see routes.media)
+    app.config['USE_X_ACCEL'] = config.x_accel
     app.config['CACHE_ENABLED'] = config.cache_enabled
     app.config['CACHE_TTL'] = config.cache_ttl
     app.config['WORKER_ENABLED'] = config.worker_enabled
     app.config['WORKER_THREADS'] = config.worker_threads
+    app.config['SCAN_THREADS'] = config.scan_threads
+    app.config['THUMBNAIL_FILTER'] = config.thumbnail_filter
+    app.config['OPTIMIZE_THUMBNAILS'] = config.optimize_thumbnails
 
     # Initialize content manager (logging happens inside get_content_manager)
     content_manager = get_content_manager(config.content_path)
@@ -66,16 +83,31 @@ def create_app(config):
             directory_ttl=config.cache_ttl,
             metadata_ttl=config.cache_ttl * METADATA_CACHE_MULTIPLIER
         )
+        # Keep ffprobe results across restarts so unchanged videos aren't re-probed
+        setup_probe_cache(os.path.join(config.thumbnail_dir, PROBE_CACHE_FILENAME))
+        atexit.register(shutdown_probe_cache)
+    
+    # Configure parallel directory listing before any scan runs
+    configure_scanner(scan_threads=config.scan_threads)
+    # Page dimension lookups are header reads too; share the same thread budget
+    configure_dimension_reads(threads=config.scan_threads)
+
+    # Configure hardware decoding before any thumbnail is generated
+    configure_ffmpeg(hwaccel=config.ffmpeg_hwaccel)
+    configure_thumbnails(resample_filter=config.thumbnail_filter)
+    setup_thumbnail_optimizer(enabled=config.optimize_thumbnails)
     
     # Register all route blueprints
     register_routes(app)
     
-    # Register cleanup handler for worker shutdown
+    # Register cleanup handlers for worker and thread pool shutdown
     atexit.register(shutdown_thumbnail_worker)
+    atexit.register(shutdown_dimension_reads)
+    atexit.register(shutdown_thumbnail_optimizer)
 
     # Preload cache if enabled (independent of workers)
     if config.cache_enabled:
-        from py_home_gallery.media.scanner import scan_directory, list_subfolders
+        from py_home_gallery.media.scanner import scan_directory, list_subfolders, get_sorted_files
         from py_home_gallery.utils.logger import get_logger
         logger = get_logger(__name__)
         logger.info("Warming up directory cache...")
@@ -84,6 +116,11 @@ def create_app(config):
             files = scan_directory(config.media_dir, use_cache=True, include_dimensions=False)
             logger.info(f"✓ Root cache warmed: {len(files)} files indexed")
 
+            # Pre-sort the newest-first list used by the infinite view, so its
+            # first request is a cache hit instead of a scan plus sort
+            get_sorted_files(config.media_dir, config.media_dir, sort_by='new', include_dimensions=False)
+            logger.info("✓ Infinite view cache warmed (newest first)")
+
             # Also warm up per-folder caches WITH dimensions for browse page
             logger.info("Warming up browse page cache (with dimensions)...")
             subfolders = list_subfolders(config.media_dir)
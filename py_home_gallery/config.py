@@ -6,79 +6,252 @@ and application configuration settings.
 """
 
 import os
+import stat
 import sys
-from argparse import ArgumentParser
+from functools import lru_cache
+from types import MappingProxyType, SimpleNamespace
+from typing import TYPE_CHECKING, Any, Mapping, Optional
 from py_home_gallery.constants import (
     DEFAULT_ITEMS_PER_PAGE,
     DEFAULT_HOST,
     DEFAULT_PORT,
+    PRODUCTION_SERVER_THREADS,
     DEFAULT_PLACEHOLDER_URL,
     DEFAULT_CACHE_TTL,
     DEFAULT_WORKER_THREADS,
+    DEFAULT_SCAN_THREADS,
     DEFAULT_MEDIA_DIR,
     THUMBNAIL_DIR_NAME,
     THUMBNAIL_SUBDIR_NAME,
     DEFAULT_LOG_DIR,
+    THUMBNAIL_FILTERS,
+    DEFAULT_THUMBNAIL_FILTER,
 )
 
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+
+# Built-in default for the thumbnail directory (~/.py-home-gallery/thumbnails)
+DEFAULT_THUMBNAIL_DIR = os.path.join(
+    os.path.expanduser('~'),
+    THUMBNAIL_DIR_NAME,
+    THUMBNAIL_SUBDIR_NAME
+)
+
+
+# Environment values accepted as "enabled", after stripping and lowercasing
+# (anything else is false)
+_TRUTHY = frozenset({'true', '1', 'yes', 'on'})
+
+
+def _env_bool(value: str) -> bool:
+    """Interpret an environment variable value as a boolean."""
+    return value.strip().lower() in _TRUTHY
+
+
+def _env_level(value: str) -> str:
+    """Normalize a log level name (interned, like the other short settings)."""
+    return sys.intern(value.upper())
+
+
+def _env_filter(value: str) -> str:
+    """Normalize a thumbnail resampling filter name (interned)."""
+    return sys.intern(value.lower())
+
+
+# Config fields: name -> (environment variables in priority order, default, converter).
+# Defaults are already of the final type; the converter is applied to env values only.
+# Short settings that get compared against literals are interned.
+_FIELDS = {
+    'media_dir': (('PY_HOME_GALLERY_MEDIA_DIR',), DEFAULT_MEDIA_DIR, str),
+    'thumbnail_dir': (('PY_HOME_GALLERY_THUMB_DIR',), DEFAULT_THUMBNAIL_DIR, str),
+    'items_per_page': (('PY_HOME_GALLERY_ITEMS_PER_PAGE',), DEFAULT_ITEMS_PER_PAGE, int),
+    'host': (('PY_HOME_GALLERY_HOST',), DEFAULT_HOST, sys.intern),
+    'port': (('PY_HOME_GALLERY_PORT', 'PORT'), DEFAULT_PORT, int),
+    'placeholder_url': (('PY_HOME_GALLERY_PLACEHOLDER',), DEFAULT_PLACEHOLDER_URL, sys.intern),
+    'skip_ffmpeg_check': ((), False, _env_bool),
+    'ffmpeg_hwaccel': (('PY_HOME_GALLERY_FFMPEG_HWACCEL',), '', sys.intern),
+    'thumbnail_filter': (('PY_HOME_GALLERY_THUMBNAIL_FILTER',), DEFAULT_THUMBNAIL_FILTER, _env_filter),
+    'optimize_thumbnails': (('PY_HOME_GALLERY_OPTIMIZE_THUMBNAILS',), False, _env_bool),
+
+    # Cache settings
+    'cache_enabled': (('PY_HOME_GALLERY_CACHE_ENABLED',), True, _env_bool),
+    'cache_ttl': (('PY_HOME_GALLERY_CACHE_TTL',), DEFAULT_CACHE_TTL, int),
+
+    # Worker settings
+    'worker_threads': (('PY_HOME_GALLERY_WORKER_THREADS',), DEFAULT_WORKER_THREADS, int),
+    'worker_enabled': (('PY_HOME_GALLERY_WORKER_ENABLED',), True, _env_bool),
+
+    # Scanner settings
+    'scan_threads': (('PY_HOME_GALLERY_SCAN_THREADS',), DEFAULT_SCAN_THREADS, int),
+
+    # Media serving settings
+    'serve_media': (('PY_HOME_GALLERY_SERVE_MEDIA',), True, _env_bool),
+    'x_sendfile': (('PY_HOME_GALLERY_X_SENDFILE',), False, _env_bool),
+    'x_accel': (('PY_HOME_GALLERY_X_ACCEL',), False, _env_bool),
+
+    # Production mode settings
+    'production': (('PY_HOME_GALLERY_PRODUCTION',), False, _env_bool),
+    'server_threads': (('PY_HOME_GALLERY_SERVER_THREADS',), PRODUCTION_SERVER_THREADS, int),
+
+    # Logging settings
+    'log_level': (('PY_HOME_GALLERY_LOG_LEVEL',), 'INFO', _env_level),
+    'log_to_file': (('PY_HOME_GALLERY_LOG_TO_FILE',), True, _env_bool),
+    'log_dir': (('PY_HOME_GALLERY_LOG_DIR',), DEFAULT_LOG_DIR, str),
+
+    # Content settings
+    'content_path': (('PY_HOME_GALLERY_CONTENT_PATH',), None, str),
+}
+
+# Command-line options that take a value: argparse dest -> Config field.
+# They only override the environment when given on the command line.
+_ARG_FIELDS = (
+    ('media_dir', 'media_dir'),
+    ('thumbnail_dir', 'thumbnail_dir'),
+    ('items_per_page', 'items_per_page'),
+    ('host', 'host'),
+    ('port', 'port'),
+    ('placeholder', 'placeholder_url'),
+    ('ffmpeg_hwaccel', 'ffmpeg_hwaccel'),
+    ('thumbnail_filter', 'thumbnail_filter'),
+    ('cache_ttl', 'cache_ttl'),
+    ('worker_threads', 'worker_threads'),
+    ('scan_threads', 'scan_threads'),
+    ('server_threads', 'server_threads'),
+    ('log_level', 'log_level'),
+    ('log_dir', 'log_dir'),
+    ('content_path', 'content_path'),
+)
+
+# What parse_args() returns for an empty command line, so starting without
+# arguments (e.g. in Docker, configured through the environment) skips argparse.
+# Kept in sync with the parser by tests/test_config.py
+_NO_ARGS = SimpleNamespace(
+    **{dest: None for dest, _ in _ARG_FIELDS},
+    skip_ffmpeg_check=False,
+    optimize_thumbnails=False,
+    no_cache=False,
+    no_worker=False,
+    no_serve_media=False,
+    x_sendfile=False,
+    x_accel=False,
+    production=False,
+    no_log_file=False,
+)
+
+
+@lru_cache(maxsize=1)
+def _env_snapshot() -> Mapping[str, str]:
+    """
+    Take a snapshot of the environment.
+
+    os.environ.get() encodes the key and decodes the value on every call,
+    so settings are read from one plain-dict copy instead.
+
+    Returns:
+        Mapping[str, str]: Read-only copy of os.environ
+    """
+    return MappingProxyType(os.environ.copy())
+
+
+@lru_cache(maxsize=None)
+def _load_env_default(name: str) -> Any:
+    """
+    Resolve a Config field from the environment.
+
+    The result is cached, so each PY_HOME_GALLERY_* variable is read and
+    converted at most once per process. Call Config.invalidate_cache()
+    after changing os.environ to pick up new values.
+
+    Args:
+        name: Config field name (a key of _FIELDS)
+
+    Returns:
+        Any: Converted environment value, or the field's default if unset
+    """
+    env_vars, default, convert = _FIELDS[name]
+    env = _env_snapshot()
+
+    for var in env_vars:
+        value = env.get(var)
+        # Empty or blank values count as unset
+        if value and not value.isspace():
+            return convert(value)
+
+    return default
+
+
+# (media_dir, thumbnail_dir, log_dir) combinations that passed validate()
+_VALIDATED = set()
+
+# Argument parser shared by all Config instances (built on first use)
+_PARSER_CACHE: Optional["ArgumentParser"] = None
+
 
 class Config:
-    """Application configuration loaded from command-line args and environment variables."""
-    
-    def __init__(self):
-        """Initialize default configuration values."""
-        default_thumb_dir = os.path.join(
-            os.path.expanduser('~'),
-            THUMBNAIL_DIR_NAME,
-            THUMBNAIL_SUBDIR_NAME
-        )
+    """
+    Application configuration loaded from command-line args and environment variables.
 
-        self.media_dir = os.environ.get('PY_HOME_GALLERY_MEDIA_DIR', DEFAULT_MEDIA_DIR)
-        self.thumbnail_dir = os.environ.get('PY_HOME_GALLERY_THUMB_DIR', default_thumb_dir)
-        self.items_per_page = int(os.environ.get('PY_HOME_GALLERY_ITEMS_PER_PAGE', str(DEFAULT_ITEMS_PER_PAGE)))
-        self.host = os.environ.get('PY_HOME_GALLERY_HOST', DEFAULT_HOST)
-        self.port = int(os.environ.get('PY_HOME_GALLERY_PORT') or os.environ.get('PORT', str(DEFAULT_PORT)))
-        self.placeholder_url = os.environ.get('PY_HOME_GALLERY_PLACEHOLDER', DEFAULT_PLACEHOLDER_URL)
-        self.skip_ffmpeg_check = False
+    Fields are resolved lazily: a setting is read from the environment the
+    first time it is accessed, unless the command line already set it.
 
-        # Cache settings
-        self.cache_enabled = os.environ.get('PY_HOME_GALLERY_CACHE_ENABLED', 'true').lower() == 'true'
-        self.cache_ttl = int(os.environ.get('PY_HOME_GALLERY_CACHE_TTL', str(DEFAULT_CACHE_TTL)))
+    The environment is read once per process: the first lookup takes a
+    snapshot of os.environ and every converted value is cached, so later
+    changes to os.environ (e.g. in tests or an embedding app) are not seen
+    by new Config instances until Config.invalidate_cache() is called.
+    """
 
-        # Worker settings
-        self.worker_threads = int(os.environ.get('PY_HOME_GALLERY_WORKER_THREADS', str(DEFAULT_WORKER_THREADS)))
-        self.worker_enabled = os.environ.get('PY_HOME_GALLERY_WORKER_ENABLED', 'true').lower() == 'true'
+    def __getattr__(self, name: str) -> Any:
+        """
+        Resolve a configuration field on first access.
 
-        # Media serving settings
-        self.serve_media = os.environ.get('PY_HOME_GALLERY_SERVE_MEDIA', 'true').lower() == 'true'
+        Only called for attributes missing from the instance; the resolved
+        value is stored on the instance so later reads are plain lookups.
 
-        # Production mode settings
-        self.production = os.environ.get('PY_HOME_GALLERY_PRODUCTION', 'false').lower() == 'true'
+        Args:
+            name: Attribute name
 
-        # Logging settings
-        self.log_level = os.environ.get('PY_HOME_GALLERY_LOG_LEVEL', 'INFO').upper()
-        self.log_to_file = os.environ.get('PY_HOME_GALLERY_LOG_TO_FILE', 'true').lower() == 'true'
-        self.log_dir = os.environ.get('PY_HOME_GALLERY_LOG_DIR', DEFAULT_LOG_DIR)
+        Returns:
+            Any: Field value
+        """
+        if name not in _FIELDS:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
-        # Content settings
-        self.content_path = os.environ.get('PY_HOME_GALLERY_CONTENT_PATH', None)
+        value = _load_env_default(name)
+        self.__dict__[name] = value
+        return value
+
+    @staticmethod
+    def invalidate_cache():
+        """Forget the cached environment values, argument parser and validated directories."""
+        global _PARSER_CACHE
+        _env_snapshot.cache_clear()
+        _load_env_default.cache_clear()
+        _PARSER_CACHE = None
+        _VALIDATED.clear()
         
     def load_from_args(self, args=None):
         """Load configuration from command-line arguments."""
-        parser = self._create_arg_parser()
-        parsed_args = parser.parse_args(args)
-        
-        self.media_dir = parsed_args.media_dir
-        self.thumbnail_dir = parsed_args.thumbnail_dir
-        self.items_per_page = parsed_args.items_per_page
-        self.host = parsed_args.host
-        self.port = parsed_args.port
-        self.placeholder_url = parsed_args.placeholder
+        if args is None:
+            args = sys.argv[1:]
+
+        if args:
+            parsed_args = self._create_arg_parser().parse_args(args)
+        else:
+            parsed_args = _NO_ARGS
+
+        # Options with values (unset options keep the environment value)
+        for dest, field in _ARG_FIELDS:
+            value = getattr(parsed_args, dest)
+            if value is not None:
+                self.__dict__[field] = value
+
         self.skip_ffmpeg_check = parsed_args.skip_ffmpeg_check
+        if parsed_args.optimize_thumbnails:
+            self.optimize_thumbnails = True
         
         # Cache and worker settings
-        self.cache_ttl = parsed_args.cache_ttl
-        self.worker_threads = parsed_args.worker_threads
         self.cache_enabled = not parsed_args.no_cache
         self.worker_enabled = not parsed_args.no_worker
 
@@ -86,6 +259,10 @@ class Config:
         if parsed_args.no_serve_media:
             self.serve_media = False
         # else: keep env var value
+        if parsed_args.x_sendfile:
+            self.x_sendfile = True
+        if parsed_args.x_accel:
+            self.x_accel = True
 
         # Production mode settings (only override if flag was explicitly passed)
         if parsed_args.production:
@@ -93,24 +270,30 @@ class Config:
         # else: keep env var value
 
         # Logging settings
-        self.log_level = parsed_args.log_level
         self.log_to_file = not parsed_args.no_log_file
-        self.log_dir = parsed_args.log_dir
-
-        # Content settings
-        if parsed_args.content_path:
-            self.content_path = parsed_args.content_path
 
         return self
     
     def _create_arg_parser(self):
-        """Create argument parser with application options."""
+        """
+        Create argument parser with application options.
+
+        Value options default to None so that unset options leave the
+        environment value in place; the parser holds no per-instance state
+        and is built once and reused.
+        """
+        global _PARSER_CACHE
+        if _PARSER_CACHE is not None:
+            return _PARSER_CACHE
+
+        # Imported here so importing this module doesn't load argparse
+        from argparse import ArgumentParser
+
         parser = ArgumentParser(description='Media Gallery Server')
         
         parser.add_argument(
             '--media-dir',
             type=str,
-            default=self.media_dir,
             help=f'Root directory containing media files (default: {DEFAULT_MEDIA_DIR}). '
                  'ENV: PY_HOME_GALLERY_MEDIA_DIR (CMD: %%USERPROFILE%%\\Media, PowerShell: $env:USERPROFILE\\Media)'
         )
@@ -118,7 +301,6 @@ class Config:
         parser.add_argument(
             '--thumbnail-dir',
             type=str,
-            default=self.thumbnail_dir,
             help=f'Directory to store generated thumbnails '
                  f'(default: ~/{THUMBNAIL_DIR_NAME}/{THUMBNAIL_SUBDIR_NAME} on Linux/Mac or C:\\Users\\YourUsername\\{THUMBNAIL_DIR_NAME}\\{THUMBNAIL_SUBDIR_NAME} on Windows). '
                  'ENV: PY_HOME_GALLERY_THUMB_DIR'
@@ -127,15 +309,13 @@ class Config:
         parser.add_argument(
             '--items-per-page',
             type=int,
-            default=self.items_per_page,
             help=f'Number of items to display per page (default: {DEFAULT_ITEMS_PER_PAGE}). '
                  'ENV: PY_HOME_GALLERY_ITEMS_PER_PAGE'
         )
 
         parser.add_argument(
             '--host',
-            type=str,
-            default=self.host,
+            type=sys.intern,
             help=f'Host to run the server on (default: {DEFAULT_HOST}). '
                  'ENV: PY_HOME_GALLERY_HOST'
         )
@@ -143,15 +323,13 @@ class Config:
         parser.add_argument(
             '--port',
             type=int,
-            default=self.port,
             help=f'Port to run the server on (default: {DEFAULT_PORT}). '
                  'ENV: PY_HOME_GALLERY_PORT'
         )
 
         parser.add_argument(
             '--placeholder',
-            type=str,
-            default=self.placeholder_url,
+            type=sys.intern,
             help=f'URL for placeholder thumbnails (default: {DEFAULT_PLACEHOLDER_URL}). '
                  'ENV: PY_HOME_GALLERY_PLACEHOLDER'
         )
@@ -161,11 +339,34 @@ class Config:
             action='store_true',
             help='Skip the check for FFmpeg installation (use at your own risk)'
         )
+
+        parser.add_argument(
+            '--ffmpeg-hwaccel',
+            type=sys.intern,
+            help='Hardware decoder for video thumbnails, e.g. auto, cuda, vaapi, qsv, videotoolbox '
+                 '(default: disabled, decode on CPU). '
+                 'ENV: PY_HOME_GALLERY_FFMPEG_HWACCEL'
+        )
+
+        parser.add_argument(
+            '--thumbnail-filter',
+            type=_env_filter,
+            choices=THUMBNAIL_FILTERS,
+            help=f'Resampling filter for image thumbnails (default: {DEFAULT_THUMBNAIL_FILTER}). '
+                 'ENV: PY_HOME_GALLERY_THUMBNAIL_FILTER'
+        )
+
+        parser.add_argument(
+            '--optimize-thumbnails',
+            action='store_true',
+            help='Losslessly shrink new video thumbnails with jpegoptim in the background '
+                 '(requires jpegoptim). '
+                 'ENV: PY_HOME_GALLERY_OPTIMIZE_THUMBNAILS'
+        )
         
         parser.add_argument(
             '--cache-ttl',
             type=int,
-            default=self.cache_ttl,
             help=f'Cache TTL in seconds (default: {DEFAULT_CACHE_TTL}). '
                  'ENV: PY_HOME_GALLERY_CACHE_TTL'
         )
@@ -173,11 +374,18 @@ class Config:
         parser.add_argument(
             '--worker-threads',
             type=int,
-            default=self.worker_threads,
             help=f'Number of background worker threads (default: {DEFAULT_WORKER_THREADS}). '
                  'ENV: PY_HOME_GALLERY_WORKER_THREADS'
         )
         
+        parser.add_argument(
+            '--scan-threads',
+            type=int,
+            help=f'Number of threads used to list directories and read media headers in parallel '
+                 f'(default: {DEFAULT_SCAN_THREADS}, 1 disables parallel scanning). '
+                 'ENV: PY_HOME_GALLERY_SCAN_THREADS'
+        )
+        
         parser.add_argument(
             '--no-cache',
             action='store_true',
@@ -197,6 +405,22 @@ class Config:
                  'ENV: PY_HOME_GALLERY_SERVE_MEDIA'
         )
 
+        parser.add_argument(
+            '--x-sendfile',
+            action='store_true',
+            help='Hand file transfers to the front-end web server with an X-Sendfile header '
+                 '(requires Apache mod_xsendfile or lighttpd). '
+                 'ENV: PY_HOME_GALLERY_X_SENDFILE'
+        )
+
+        parser.add_argument(
+            '--x-accel',
+            action='store_true',
+            help='Hand file transfers to Nginx with an X-Accel-Redirect header '
+                 '(requires the internal /_media/ and /_thumbnails/ locations of the bundled nginx.conf). '
+                 'ENV: PY_HOME_GALLERY_X_ACCEL'
+        )
+
         parser.add_argument(
             '--production',
             action='store_true',
@@ -204,10 +428,16 @@ class Config:
                  'ENV: PY_HOME_GALLERY_PRODUCTION'
         )
 
+        parser.add_argument(
+            '--server-threads',
+            type=int,
+            help=f'Number of request threads for the production server (default: {PRODUCTION_SERVER_THREADS}). '
+                 'ENV: PY_HOME_GALLERY_SERVER_THREADS'
+        )
+
         parser.add_argument(
             '--log-level',
-            type=str,
-            default=self.log_level,
+            type=sys.intern,
             choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
             help='Logging level (default: INFO). '
                  'ENV: PY_HOME_GALLERY_LOG_LEVEL'
@@ -222,7 +452,6 @@ class Config:
         parser.add_argument(
             '--log-dir',
             type=str,
-            default=self.log_dir,
             help='Directory for log files (default: ./logs). '
                  'ENV: PY_HOME_GALLERY_LOG_DIR'
         )
@@ -230,34 +459,48 @@ class Config:
         parser.add_argument(
             '--content-path',
             type=str,
-            default=self.content_path,
             help='Path to custom content.json file for UI customization. '
                  'If not specified, looks for content.json in current directory. '
                  'ENV: PY_HOME_GALLERY_CONTENT_PATH'
         )
 
+        _PARSER_CACHE = parser
         return parser
         
     def validate(self):
-        """Validate the configuration."""
+        """
+        Validate the configuration.
+
+        Checks already passed for the same directories are not repeated.
+        """
         self.media_dir = os.path.abspath(self.media_dir)
         self.thumbnail_dir = os.path.abspath(self.thumbnail_dir)
+
+        key = (self.media_dir, self.thumbnail_dir, self.log_dir if self.log_to_file else None)
+        if key in _VALIDATED:
+            return self
         
-        if not os.path.exists(self.media_dir):
+        # One stat answers both "does it exist" and "is it a directory"
+        try:
+            media_is_dir = stat.S_ISDIR(os.stat(self.media_dir).st_mode)
+        except OSError:
             print(f"Error: Media directory '{self.media_dir}' does not exist.")
             sys.exit(1)
             
-        if not os.path.isdir(self.media_dir):
+        if not media_is_dir:
             print(f"Error: Media path '{self.media_dir}' is not a directory.")
             sys.exit(1)
             
-        # Create thumbnail directory if it doesn't exist
-        os.makedirs(self.thumbnail_dir, exist_ok=True)
+        # Create thumbnail directory if it doesn't exist (makedirs on an
+        # existing directory still costs a failing mkdir plus a stat)
+        if not os.path.isdir(self.thumbnail_dir):
+            os.makedirs(self.thumbnail_dir, exist_ok=True)
         
         # Create log directory if logging to file is enabled
-        if self.log_to_file:
+        if self.log_to_file and not os.path.isdir(self.log_dir):
             os.makedirs(self.log_dir, exist_ok=True)
-        
+
+        _VALIDATED.add(key)
         return self
         
     def display(self):
@@ -268,10 +511,15 @@ class Config:
         print(f"Items Per Page: {self.items_per_page}")
         print(f"Host: {self.host}")
         print(f"Port: {self.port}")
-        print(f"Production Mode: {self.production}")
-        print(f"Serve Media: {self.serve_media}")
+        print(f"Production Mode: {self.production}{f' (Threads: {self.server_threads})' if self.production else ''}")
+        print(f"Serve Media: {self.serve_media}{' (X-Sendfile)' if self.x_sendfile else ''}"
+              f"{' (X-Accel-Redirect)' if self.x_accel else ''}")
         print(f"Cache Enabled: {self.cache_enabled} (TTL: {self.cache_ttl}s)")
         print(f"Background Workers: {self.worker_threads if self.worker_enabled else 'Disabled'}")
+        print(f"Scan Threads: {self.scan_threads}")
+        print(f"FFmpeg Hardware Decoding: {self.ffmpeg_hwaccel or 'Disabled'}")
+        print(f"Thumbnail Filter: {self.thumbnail_filter}")
+        print(f"Optimize Thumbnails: {self.optimize_thumbnails}")
         print(f"Log Level: {self.log_level}")
         print(f"Log to File: {self.log_to_file}{f' (Dir: {self.log_dir})' if self.log_to_file else ''}")
 
@@ -29,6 +29,27 @@ MOSAIC_MIN_COUNT = 1
 THUMBNAIL_WIDTH = 300
 THUMBNAIL_HEIGHT = 200
 
+# Resampling filters for image thumbnails (names accepted by --thumbnail-filter)
+THUMBNAIL_FILTERS = ('lanczos', 'bicubic', 'bilinear', 'nearest')
+DEFAULT_THUMBNAIL_FILTER = 'lanczos'
+
+# Thumbnails are stored as progressive JPEGs; files from older versions
+# (PNG) keep their extension and are still found and served
+THUMBNAIL_EXTENSION = '.jpg'
+LEGACY_THUMBNAIL_EXTENSION = '.png'
+THUMBNAIL_JPEG_QUALITY = 82
+# Equivalent ffmpeg MJPEG quality scale (2-31, lower is better)
+THUMBNAIL_FFMPEG_QSCALE = 4
+
+# Run a full garbage collection after this many moviepy thumbnails, so
+# reference cycles holding decoded frames and readers don't pile up
+MOVIEPY_GC_INTERVAL = 64
+
+# jpegoptim post-processing of ffmpeg thumbnails (--optimize-thumbnails):
+# per-file timeout in seconds and maximum number of files waiting
+THUMBNAIL_OPTIMIZE_TIMEOUT = 10
+THUMBNAIL_OPTIMIZE_QUEUE_SIZE = 1000
+
 # Thumbnail aspect ratio (16:9 for videos)
 THUMBNAIL_ASPECT_WIDTH = 16
 THUMBNAIL_ASPECT_HEIGHT = 9
@@ -37,6 +58,14 @@ THUMBNAIL_ASPECT_HEIGHT = 9
 THUMBNAIL_169_WIDTH = 300
 THUMBNAIL_169_HEIGHT = 169  # 300 * 9 / 16
 
+# Timeouts (seconds) for the ffmpeg frame grab and ffprobe duration lookup
+FFMPEG_TIMEOUT = 30
+FFPROBE_TIMEOUT = 10
+
+# How long a request waits (seconds) for a thumbnail that another request or
+# the background worker is already generating
+THUMBNAIL_WAIT_TIMEOUT = 30.0
+
 # Media dimension validation bounds
 MIN_MEDIA_DIMENSION = 10
 MAX_MEDIA_DIMENSION = 50000
@@ -58,6 +87,25 @@ CACHE_PREFIX_FILE = "file:"
 CACHE_SUFFIX_WITH_DIMS = "_with_dims"
 CACHE_SUFFIX_NO_DIMS = "_no_dims"
 
+# Maximum number of image dimensions memoized by (path, mtime, size); the
+# oldest entries are dropped first once the cap is reached
+DIMENSION_CACHE_MAX_ENTRIES = 50000
+
+# Maximum number of thumbnail locations remembered by find_thumbnail (oldest
+# dropped first); found thumbnails are then served without an extra stat
+THUMBNAIL_LOOKUP_CACHE_MAX_ENTRIES = 100000
+
+# Maximum number of memoized thumbnail file names and sharded paths; these
+# are pure functions of the media path, recomputed only after eviction
+THUMBNAIL_NAME_CACHE_MAX_ENTRIES = 100000
+
+# Maximum number of successful ffprobe results memoized in memory by
+# (path, mtime, size); oldest dropped first, failed probes are not kept
+PROBE_MEMO_MAX_ENTRIES = 4096
+
+# Persistent ffprobe result cache (SQLite), stored in the thumbnail directory
+PROBE_CACHE_FILENAME = "probe_cache.sqlite3"
+
 
 # ============================================================================
 # BACKGROUND WORKERS
@@ -66,7 +114,8 @@ CACHE_SUFFIX_NO_DIMS = "_no_dims"
 # Default number of thumbnail generation worker threads
 DEFAULT_WORKER_THREADS = 2
 
-# Maximum queue size for thumbnail generation jobs
+# Maximum number of queued background (preload) thumbnail jobs; on-demand
+# jobs for thumbnails a page is waiting on are not counted against it
 WORKER_MAX_QUEUE_SIZE = 500
 
 # Batch size for preloading thumbnails
@@ -75,6 +124,14 @@ PRELOAD_BATCH_SIZE = 500
 # Worker job timeout in seconds
 WORKER_JOB_TIMEOUT = 30.0
 
+# Thumbnail job priorities (lower runs first): thumbnails a page is showing
+# right now go ahead of the startup preload backlog
+WORKER_PRIORITY_ON_DEMAND = 0
+WORKER_PRIORITY_PRELOAD = 10
+
+# Default number of threads used to list directories in parallel during scans
+DEFAULT_SCAN_THREADS = 8
+
 
 # ============================================================================
 # SERVER
@@ -86,8 +143,12 @@ DEFAULT_HOST = "0.0.0.0"
 # Default port
 DEFAULT_PORT = 8000
 
-# Production server thread count
-PRODUCTION_SERVER_THREADS = 4
+# Browser cache lifetime (seconds) for media files and thumbnails
+MEDIA_CACHE_MAX_AGE = 31536000  # 1 year
+
+# Production server thread count. Thumbnail requests spend most of their time
+# waiting on ffmpeg or disk I/O, so more threads than cores is fine here.
+PRODUCTION_SERVER_THREADS = 8
 
 
 # ============================================================================
@@ -3,9 +3,87 @@ Helper functions for extracting media dimensions.
 """
 
 import os
-import hashlib
-from typing import List, Dict, Any
-from py_home_gallery.media.dimensions import get_media_dimensions
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+from py_home_gallery.media.dimensions import get_media_dimensions_cached
+from py_home_gallery.media.utils import find_thumbnail
+from py_home_gallery.constants import DEFAULT_SCAN_THREADS
+
+# Number of threads used to read media headers for one page of items
+_dimension_threads = DEFAULT_SCAN_THREADS
+# Shared pool, created on first use so requests don't spawn threads each time
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def configure_dimension_reads(threads: int = DEFAULT_SCAN_THREADS) -> None:
+    """
+    Configure how many media headers are read in parallel.
+
+    Should be called once during application startup with config values.
+
+    Args:
+        threads: Number of threads reading dimensions (1 reads serially)
+    """
+    global _dimension_threads, _executor
+
+    with _executor_lock:
+        _dimension_threads = max(1, threads)
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+def shutdown_dimension_reads() -> None:
+    """Shut down the shared dimension-reading thread pool, if it was started."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared dimension-reading thread pool, creating it if needed.
+
+    Returns:
+        ThreadPoolExecutor: Shared thread pool
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_dimension_threads,
+                thread_name_prefix="DimensionWorker"
+            )
+        return _executor
+
+
+def read_dimensions(tasks: List[Tuple[str, Optional[str], Optional[os.stat_result]]]) -> Iterable[Tuple[int, int]]:
+    """
+    Get the dimensions of several media files, reading them in parallel.
+
+    Each uncached lookup is a stat plus a header read, so with more than one
+    task they run on the shared thread pool. Results keep the order of tasks.
+
+    Args:
+        tasks: (full media path, thumbnail path or None, stat() result or None)
+
+    Returns:
+        Iterable[Tuple[int, int]]: (width, height) for each task, in order
+    """
+    if _dimension_threads > 1 and len(tasks) > 1:
+        return _get_executor().map(
+            lambda task: get_media_dimensions_cached(task[0], task[2], task[1]),
+            tasks
+        )
+
+    return (get_media_dimensions_cached(full_path, st, thumbnail_path)
+            for full_path, thumbnail_path, st in tasks)
 
 
 def add_dimensions_to_items(items: List[Dict[str, Any]], media_root: str, thumbnail_dir: str) -> None:
@@ -15,28 +93,30 @@ def add_dimensions_to_items(items: List[Dict[str, Any]], media_root: str, thumbn
     Modifies items in-place by adding 'width' and 'height' keys.
     For videos, checks if thumbnail exists and uses its dimensions.
 
+    The items of a page are read in parallel (see read_dimensions).
+
     Args:
         items: List of media item dictionaries (modified in-place)
         media_root: Root media directory path
         thumbnail_dir: Directory where thumbnails are stored
     """
+    # Item paths are always relative to media_root, so plain concatenation
+    # gives the same result as os.path.join without its per-call checks
+    root_prefix = media_root if media_root.endswith(os.sep) else media_root + os.sep
+
+    tasks = []
     for item in items:
-        full_path = os.path.join(media_root, item['path'])
+        path = item['path']
+        full_path = root_prefix + path
 
         # For videos, pass thumbnail path so we can use its dimensions if it exists
+        # (find_thumbnail also finds PNG thumbnails from older versions)
         thumbnail_path = None
-        if item['path'].lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv')):
-            safe_filename = item['path'].replace('\\', '_').replace('/', '_')
-
-            # Handle very long filenames
-            if len(safe_filename) > 200:
-                file_hash = hashlib.md5(safe_filename.encode()).hexdigest()
-                extension = os.path.splitext(safe_filename)[1]
-                safe_filename = f"{file_hash}{extension}"
+        if item['media_type'] == 'video':
+            thumbnail_path = find_thumbnail(thumbnail_dir, path)
 
-            thumbnail_path = os.path.join(thumbnail_dir, f"{safe_filename}.png")
+        tasks.append((full_path, thumbnail_path, None))
 
-        # Extract dimensions
-        width, height = get_media_dimensions(full_path, thumbnail_path=thumbnail_path)
-        item['width'] = width
-        item['height'] = height
+    # Extract dimensions
+    for item, dims in zip(items, read_dimensions(tasks)):
+        item['width'], item['height'] = dims
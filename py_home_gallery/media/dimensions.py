@@ -7,13 +7,26 @@ without loading the entire file into memory.
 
 import os
 import re
+import struct
+from functools import lru_cache
 from typing import Tuple, Optional
 from PIL import Image
 from py_home_gallery.utils.logger import get_logger
+from py_home_gallery.utils.ffmpeg import get_video_resolution
+from py_home_gallery.utils.cache import get_cached_dimensions, set_cached_dimensions
+from py_home_gallery.media.utils import get_media_type, is_video
 
 logger = get_logger(__name__)
 
+# Extensions read as images here besides the gallery's own image types
+# (PIL can also read TIFF headers)
+_EXTRA_IMAGE_EXTENSIONS = ('.tiff',)
 
+# Width x height in a filename (e.g., 1920x1080, 958x1278)
+_DIMENSIONS_RE = re.compile(r'(\d{3,5})[xX](\d{3,5})')
+
+
+@lru_cache(maxsize=65536)
 def extract_dimensions_from_filename(filename: str) -> Optional[Tuple[int, int]]:
     """
     Try to extract dimensions from filename patterns like:
@@ -21,15 +34,15 @@ def extract_dimensions_from_filename(filename: str) -> Optional[Tuple[int, int]]
     - photo_1080x1920.jpg
     - 1200x800.png
 
+    Results are memoized, since the same names come up on every rescan.
+
     Args:
         filename: The filename to parse
 
     Returns:
         Optional[Tuple[int, int]]: (width, height) if found, None otherwise
     """
-    # Pattern matches: width x height (e.g., 1920x1080, 958x1278)
-    pattern = r'(\d{3,5})[xX](\d{3,5})'
-    match = re.search(pattern, filename)
+    match = _DIMENSIONS_RE.search(filename)
 
     if match:
         width = int(match.group(1))
@@ -43,11 +56,113 @@ def extract_dimensions_from_filename(filename: str) -> Optional[Tuple[int, int]]
     return None
 
 
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# JPEG start-of-frame markers (baseline, progressive, lossless, arithmetic)
+_JPEG_SOF_MARKERS = frozenset({
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF
+})
+
+
+def _read_jpeg_dimensions(f) -> Optional[Tuple[int, int]]:
+    """
+    Find the frame size in a JPEG by walking its markers up to the first SOF.
+
+    Args:
+        f: Binary file object positioned right after the SOI marker
+
+    Returns:
+        Optional[Tuple[int, int]]: (width, height) or None if not found
+    """
+    while True:
+        byte = f.read(1)
+        # Skip to the next marker, then past any fill bytes
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+
+        marker = byte[0]
+        if marker in _JPEG_SOF_MARKERS:
+            # Segment length (2), sample precision (1), then height and width
+            segment = f.read(7)
+            if len(segment) < 7:
+                return None
+            height, width = struct.unpack('>HH', segment[3:7])
+            return (width, height)
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # Standalone markers carry no length
+            continue
+        if marker in (0xD9, 0xDA):
+            # End of image or start of scan before any frame header
+            return None
+
+        length = f.read(2)
+        if len(length) < 2:
+            return None
+        f.seek(struct.unpack('>H', length)[0] - 2, os.SEEK_CUR)
+
+
+def _read_header_dimensions(image_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Read image dimensions straight from the file header.
+
+    PNG, GIF, BMP and WebP store their size at fixed offsets in the first 30
+    bytes, and JPEG in the first frame marker, so this avoids PIL's format
+    detection and Image object setup for the formats the gallery lists.
+
+    Args:
+        image_path: Path to the image file
+
+    Returns:
+        Optional[Tuple[int, int]]: (width, height), or None for other formats
+            or unexpected headers
+    """
+    with open(image_path, 'rb') as f:
+        head = f.read(30)
+
+        if head.startswith(_PNG_SIGNATURE) and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+
+        if head[:2] == b'BM' and len(head) >= 26:
+            if struct.unpack('<I', head[14:18])[0] == 12:
+                # OS/2 BITMAPCOREHEADER: 16-bit sizes
+                return struct.unpack('<HH', head[18:22])
+            width, height = struct.unpack('<ii', head[18:26])
+            # Negative height means a top-down bitmap
+            return (width, abs(height))
+
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP' and len(head) >= 30:
+            chunk = head[12:16]
+            if chunk == b'VP8X':
+                return (int.from_bytes(head[24:27], 'little') + 1,
+                        int.from_bytes(head[27:30], 'little') + 1)
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', head[26:30])
+                return (width & 0x3FFF, height & 0x3FFF)
+            if chunk == b'VP8L':
+                bits = int.from_bytes(head[21:25], 'little')
+                return ((bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+            return None
+
+        if head[:2] == b'\xff\xd8':
+            f.seek(2)
+            return _read_jpeg_dimensions(f)
+
+    return None
+
+
 def get_image_dimensions(image_path: str) -> Optional[Tuple[int, int]]:
     """
     Get dimensions of an image file without loading it entirely.
 
-    PIL can read image headers to get dimensions quickly.
+    The size is parsed from the header for PNG, JPEG, GIF, BMP and WebP;
+    other formats (and anything the parser doesn't recognize) go through
+    PIL, which also only reads the header.
 
     Args:
         image_path: Path to the image file
@@ -55,6 +170,14 @@ def get_image_dimensions(image_path: str) -> Optional[Tuple[int, int]]:
     Returns:
         Optional[Tuple[int, int]]: (width, height) or None if failed
     """
+    try:
+        dims = _read_header_dimensions(image_path)
+        if dims and dims[0] > 0 and dims[1] > 0:
+            logger.debug(f"Image dimensions for {os.path.basename(image_path)}: {dims[0]}x{dims[1]}")
+            return dims
+    except (OSError, struct.error) as e:
+        logger.debug(f"Could not parse image header for {image_path}: {e}")
+
     try:
         with Image.open(image_path) as img:
             width, height = img.size
@@ -73,7 +196,8 @@ def get_video_dimensions(video_path: str, fast_mode: bool = True) -> Optional[Tu
     In fast mode (default), returns standard 16:9 aspect ratio immediately
     without opening the video file. This is much faster for bulk scanning.
 
-    In slow mode, uses moviepy to read actual video metadata.
+    In slow mode, reads the actual frame size with ffprobe (cached across
+    restarts), falling back to moviepy.
 
     Args:
         video_path: Path to the video file
@@ -88,8 +212,14 @@ def get_video_dimensions(video_path: str, fast_mode: bool = True) -> Optional[Tu
         logger.debug(f"Using fast mode for {os.path.basename(video_path)}: 1920x1080")
         return (1920, 1080)
 
+    # Slow mode: probe the container header with ffprobe
+    dims = get_video_resolution(video_path)
+    if dims:
+        logger.debug(f"Video dimensions for {os.path.basename(video_path)}: {dims[0]}x{dims[1]}")
+        return dims
+
     try:
-        # Slow mode: actually open video and read dimensions
+        # ffprobe unavailable: actually open video and read dimensions
         try:
             from moviepy.editor import VideoFileClip
         except ImportError:
@@ -114,10 +244,11 @@ def get_media_dimensions(file_path: str, fast_mode: bool = True, thumbnail_path:
     Get dimensions of a media file (image or video).
 
     Uses a fast multi-step approach:
-    1. For videos: check if thumbnail exists and use its dimensions
-    2. Try extracting from filename (instant)
-    3. For images: read PIL headers (fast)
-    4. For videos: use defaults (instant)
+    1. For images: use dimensions encoded in the filename (instant, no I/O)
+    2. For videos: check if thumbnail exists and use its dimensions
+    3. For videos: use filename dimensions scaled to thumbnail size
+    4. For images: read the file header (fast)
+    5. For videos: use defaults (instant)
 
     Args:
         file_path: Path to the media file
@@ -127,25 +258,30 @@ def get_media_dimensions(file_path: str, fast_mode: bool = True, thumbnail_path:
     Returns:
         Tuple[int, int]: (width, height), defaults to 800x600 if all methods fail
     """
+    # Determine file type by extension
+    media_type = get_media_type(file_path)
+    is_video_file = media_type == 'video'
+
+    # STEP 1: Dimensions in the filename (e.g. 1920x1080_abc.jpg) are the
+    # cheapest answer; for images they are final, so the file isn't touched
+    dims_from_filename = extract_dimensions_from_filename(os.path.basename(file_path))
+    if dims_from_filename and not is_video_file:
+        return dims_from_filename
+
     # Check if file exists
     if not os.path.exists(file_path):
         logger.debug(f"File not found: {file_path}")
         return (800, 600)
 
-    # Determine file type by extension
-    ext = os.path.splitext(file_path)[1].lower()
-
-    # STEP 1: For videos, if thumbnail exists, use its dimensions (most accurate)
-    if ext in ('.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv'):
+    # STEP 2: For videos, if thumbnail exists, use its dimensions (most accurate)
+    if is_video_file:
         if thumbnail_path and os.path.exists(thumbnail_path):
             dims = get_image_dimensions(thumbnail_path)
             if dims:
                 logger.debug(f"Using existing thumbnail dimensions for {os.path.basename(file_path)}: {dims}")
                 return dims
 
-        # If no thumbnail, try to extract video dimensions from filename
-        filename = os.path.basename(file_path)
-        dims_from_filename = extract_dimensions_from_filename(filename)
+        # STEP 3: If no thumbnail, use video dimensions from the filename
         if dims_from_filename:
             # Scale down to thumbnail size while preserving aspect ratio
             width, height = dims_from_filename
@@ -161,14 +297,8 @@ def get_media_dimensions(file_path: str, fast_mode: bool = True, thumbnail_path:
         # Default video thumbnails: assume landscape
         return (300, 169)  # 16:9 aspect ratio scaled to thumbnail size
 
-    # STEP 2: Try extracting from filename (instant, no I/O)
-    filename = os.path.basename(file_path)
-    dims_from_filename = extract_dimensions_from_filename(filename)
-    if dims_from_filename:
-        return dims_from_filename
-
-    # STEP 3: Image formats - read actual dimensions (fast with PIL)
-    if ext in ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tiff'):
+    # STEP 4: Image formats - read actual dimensions from the header
+    if media_type == 'image' or file_path.lower().endswith(_EXTRA_IMAGE_EXTENSIONS):
         dims = get_image_dimensions(file_path)
         if dims:
             return dims
@@ -179,3 +309,41 @@ def get_media_dimensions(file_path: str, fast_mode: bool = True, thumbnail_path:
     # Default fallback
     logger.debug(f"Using default dimensions for {file_path}")
     return (800, 600)
+
+
+def get_media_dimensions_cached(file_path: str, st: Optional[os.stat_result] = None,
+                                thumbnail_path: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Get dimensions of a media file, memoizing image results.
+
+    Image dimensions are cached on (path, mtime, size), so rescans and sort
+    changes don't re-read unchanged headers. Videos are not cached: their
+    dimensions come from the thumbnail, which may be generated later.
+
+    Args:
+        file_path: Path to the media file
+        st: stat() result of the file if the caller already has it (saves a stat)
+        thumbnail_path: Optional path to thumbnail file (for videos)
+
+    Returns:
+        Tuple[int, int]: (width, height), see get_media_dimensions
+    """
+    if is_video(file_path):
+        return get_media_dimensions(file_path, thumbnail_path=thumbnail_path)
+
+    dims = extract_dimensions_from_filename(os.path.basename(file_path))
+    if dims:
+        return dims
+
+    if st is None:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return get_media_dimensions(file_path)
+
+    key = (file_path, st.st_mtime_ns, st.st_size)
+    dims = get_cached_dimensions(key)
+    if dims is None:
+        dims = get_media_dimensions(file_path)
+        set_cached_dimensions(key, dims)
+    return dims
@@ -6,11 +6,16 @@ and listing available media files.
 """
 
 import os
-from typing import List, Tuple, Optional, Dict, Any
-from py_home_gallery.utils.security import get_safe_path, validate_media_extension
+import stat
+import threading
+from operator import itemgetter
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Tuple, Optional, Dict, Any, Iterator
+from py_home_gallery.utils.security import get_safe_path
 from py_home_gallery.utils.logger import get_logger
 from py_home_gallery.utils.cache import get_directory_cache, cache_key_for_directory
-from py_home_gallery.media.dimensions import get_media_dimensions
+from py_home_gallery.media.dimension_helper import read_dimensions
+from py_home_gallery.media.utils import get_media_type, clear_thumbnail_lookups
 from py_home_gallery.constants import (
     CACHE_SUFFIX_WITH_DIMS,
     CACHE_SUFFIX_NO_DIMS,
@@ -18,15 +23,44 @@ from py_home_gallery.constants import (
     DEFAULT_VIDEO_HEIGHT,
     DEFAULT_IMAGE_WIDTH,
     DEFAULT_IMAGE_HEIGHT,
+    DEFAULT_SCAN_THREADS,
 )
 
 logger = get_logger(__name__)
-directory_cache = get_directory_cache()
+# Number of threads used to list directories (configured via configure_scanner)
+_scan_threads = DEFAULT_SCAN_THREADS
+# Effective user id and group ids for permission checks (None where the OS
+# has no uids)
+_EUID = os.geteuid() if hasattr(os, 'geteuid') else None
+_GROUPS = frozenset(os.getgroups()) | {os.getegid()} if _EUID is not None else frozenset()
+# Subfolder listings keyed by directory: (directory mtime_ns, subfolder names)
+_subfolder_cache: Dict[str, Tuple[int, List[str]]] = {}
+# URL prefixes of video thumbnails and directly served images
+_THUMBNAIL_URL_PREFIX = '/thumbnail/'
+_MEDIA_URL_PREFIX = '/media/'
+# Per-directory state of a scan: (directory mtime_ns, media items directly in
+# the directory with their file's (mtime_ns, size), subdirectory paths)
+_DirSnapshot = Tuple[Optional[int], List[Tuple[Dict[str, Any], Tuple[int, int]]], List[str]]
+# Last scan of each tree keyed by (scan root, include_dimensions), mapping every
+# directory below the root to its snapshot
+_scan_snapshots: Dict[Tuple[str, bool], Dict[str, _DirSnapshot]] = {}
+# Basename -> relative paths, per media root, stored with the scan result it
+# was built from (rebuilt when the scanner returns a different list)
+_basename_indexes: Dict[str, Tuple[List[Dict[str, Any]], Dict[str, List[str]]]] = {}
+
+# Scans currently running, by cache key, so concurrent requests that miss the
+# cache wait for one scan instead of each walking the same tree
+_inflight_scans: Dict[str, Future] = {}
+_inflight_scans_lock = threading.Lock()
 
 
 def list_subfolders(directory: str) -> List[str]:
     """
     List all subfolders in a given directory.
+
+    Uses os.scandir() so each entry's type comes from the directory listing
+    instead of a stat() per entry. The result is memoized until the
+    directory's mtime changes (adding/removing a subfolder updates it).
     
     Args:
         directory: Path to the directory to scan
@@ -35,21 +69,33 @@ def list_subfolders(directory: str) -> List[str]:
         List[str]: List of subfolder names
     """
     try:
-        if not os.path.exists(directory):
+        # One stat gives existence, type and the mtime used for the memo
+        try:
+            st = os.stat(directory)
+        except FileNotFoundError:
             logger.warning(f"Directory does not exist: {directory}")
             return []
         
-        if not os.path.isdir(directory):
+        if not stat.S_ISDIR(st.st_mode):
             logger.warning(f"Path is not a directory: {directory}")
             return []
+
+        mtime_ns = st.st_mtime_ns
+        cached = _subfolder_cache.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            return list(cached[1])
         
         subfolders = []
-        for name in os.listdir(directory):
-            folder_path = os.path.join(directory, name)
-            if os.path.isdir(folder_path):
-                subfolders.append(name)
-        
-        return subfolders
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        subfolders.append(entry.name)
+                except OSError:
+                    continue
+
+        _subfolder_cache[directory] = (mtime_ns, subfolders)
+        return list(subfolders)
     except PermissionError:
         logger.error(f"Permission denied accessing directory: {directory}")
         return []
@@ -84,12 +130,14 @@ def validate_and_get_folder_path(media_root: str, folder: Optional[str]) -> Opti
             logger.warning(f"Path traversal attempt detected: {folder}")
             return None
         
-        # Check if path exists and is a directory
-        if not os.path.exists(folder_path):
+        # Check if path exists and is a directory (a single stat)
+        try:
+            st = os.stat(folder_path)
+        except FileNotFoundError:
             logger.warning(f"Folder does not exist: {folder_path}")
             return None
         
-        if not os.path.isdir(folder_path):
+        if not stat.S_ISDIR(st.st_mode):
             logger.warning(f"Path is not a directory: {folder_path}")
             return None
         
@@ -100,103 +148,350 @@ def validate_and_get_folder_path(media_root: str, folder: Optional[str]) -> Opti
         return None
 
 
-def scan_directory(directory: str, use_cache: bool = True, include_dimensions: bool = True) -> List[Dict[str, Any]]:
+def _is_readable(st: os.stat_result, path: str) -> bool:
     """
-    Recursively scans a directory for media files (images and videos).
-    Returns a list of dictionaries containing file info including dimensions.
+    Check whether the current process can read a file.
 
-    Uses caching to improve performance on repeated scans.
+    Decided from the stat result the scan already has, using the permission
+    bits that apply to this process (owner, group or other), so readable
+    files need no os.access() syscall. Only files whose bits deny reading
+    are double-checked with os.access(), since ACLs can grant extra access.
 
     Args:
-        directory: Path to the directory to scan
-        use_cache: Whether to use cache (default: True)
-        include_dimensions: Whether to extract dimensions (default: True, set False for faster scanning)
+        st: stat() result of the file
+        path: Path of the file (used for the os.access() fallback)
 
     Returns:
-        List[Dict[str, Any]]: List of dictionaries with keys:
-            - path: relative path to media file
-            - thumbnail: URL path to thumbnail
-            - width: media width in pixels (if include_dimensions=True, otherwise default values)
-            - height: media height in pixels (if include_dimensions=True, otherwise default values)
+        bool: True if the file is readable
     """
-    # Try to get from cache first
-    if use_cache:
-        # Use different cache keys for with/without dimensions
-        cache_suffix = CACHE_SUFFIX_WITH_DIMS if include_dimensions else CACHE_SUFFIX_NO_DIMS
-        cache_key = cache_key_for_directory(directory) + cache_suffix
-        cached_result = directory_cache.get(cache_key)
-        if cached_result is not None:
-            logger.info(f"Using cached scan result for: {directory} ({len(cached_result)} files, dims={include_dimensions})")
-            return cached_result
+    if _EUID is None:
+        # On Windows os.access(R_OK) only checks that the file exists, which
+        # the stat already showed
+        return True
+    if _EUID == 0:
+        return True
+    if st.st_uid == _EUID:
+        return bool(st.st_mode & stat.S_IRUSR)
+
+    if st.st_gid in _GROUPS:
+        readable = st.st_mode & stat.S_IRGRP
+    else:
+        readable = st.st_mode & stat.S_IROTH
+    return bool(readable) or os.access(path, os.R_OK)
+
+
+def configure_scanner(scan_threads: int = DEFAULT_SCAN_THREADS) -> None:
+    """
+    Configure directory scanning settings.
 
-    media = []
+    Should be called once during application startup with config values.
+
+    Args:
+        scan_threads: Number of threads used to list directories in parallel
+            (1 disables parallel listing)
+    """
+    global _scan_threads
+
+    _scan_threads = max(1, scan_threads)
+    logger.info(f"Scanner configured - Scan threads: {_scan_threads}")
+
+
+def _versioned_cache_key(directory: str, suffix: str) -> Optional[str]:
+    """
+    Build a cache key for a directory that embeds the directory's mtime.
+
+    Adding or removing an entry updates the directory's own mtime, so such
+    changes produce a new key and the stale entry is simply never read again
+    (it ages out through the cache TTL).
+
+    Args:
+        directory: Directory path
+        suffix: Cache key suffix (dimension flag, sort type)
+
+    Returns:
+        Optional[str]: Cache key, or None if the directory cannot be stat'ed
+    """
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+    return f"{cache_key_for_directory(directory)}{suffix}@{mtime_ns}"
+
+
+def clear_scan_cache() -> None:
+    """Drop all cached scan and sorted results so the next request rescans."""
+    get_directory_cache().clear()
+    _subfolder_cache.clear()
+    _scan_snapshots.clear()
+    _basename_indexes.clear()
+    clear_thumbnail_lookups()
+
+
+def _list_directory(path: str, previous: Optional[Dict[str, _DirSnapshot]] = None
+                    ) -> Tuple[Optional[int], Optional[List[Tuple[os.DirEntry, str]]], List[str]]:
+    """
+    List a single directory, splitting entries into files and subdirectories.
+
+    Each file is classified by extension here, once, and media files also get
+    their stat() result cached on the DirEntry, so when listings run on worker
+    threads the metadata round-trips overlap too.
+
+    When snapshots of a previous scan are given, the directory is stat'ed
+    first: adding, removing or renaming an entry updates its mtime, so an
+    unchanged mtime means the previous listing still holds and the directory
+    is not read at all.
+
+    Args:
+        path: Directory to list
+        previous: Snapshots of the previous scan, or None to skip mtime tracking
+
+    Returns:
+        Tuple of (directory mtime_ns or None, (entry, media type) pairs for
+        files including broken symlinks or None if unchanged since the
+        previous scan, subdirectory paths). Symlinked directories are
+        skipped, matching os.walk().
+    """
+    mtime_ns = None
+    if previous is not None:
+        # Stat before listing, so a change made during the listing shows up
+        # as a different mtime on the next scan
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            pass
+
+        snapshot = previous.get(path)
+        if mtime_ns is not None and snapshot is not None and snapshot[0] == mtime_ns:
+            return mtime_ns, None, snapshot[2]
+
+    files = []
+    subdirs = []
+
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        continue
+                except OSError:
+                    pass
+
+                media_type = get_media_type(entry.name)
+                if media_type != 'unknown':
+                    try:
+                        entry.stat()
+                    except OSError:
+                        # Reported by the caller when it stats the entry again
+                        pass
+
+                files.append((entry, media_type))
+    except PermissionError:
+        logger.warning(f"Permission denied accessing directory: {path}")
+    except OSError as e:
+        logger.warning(f"Error listing directory {path}: {e}")
+
+    return mtime_ns, files, subdirs
+
+
+def _scandir_walk(directory: str, max_workers: int = 1,
+                  previous: Optional[Dict[str, _DirSnapshot]] = None
+                  ) -> Iterator[Tuple[str, Optional[int], Optional[List[Tuple[os.DirEntry, str]]], List[str]]]:
+    """
+    Recursively yield the listing of every directory below a directory.
+
+    Built on os.scandir() so file types come from the directory listing
+    itself instead of an extra stat() per entry, and each DirEntry caches its
+    own stat() result. With more than one worker, every subdirectory is
+    listed as a separate task on a thread pool, which overlaps the metadata
+    latency of network filesystems. Listings are always produced in the same
+    top-down order as os.walk(), and symlinked directories are not followed.
+
+    Args:
+        directory: Path to the directory to walk
+        max_workers: Number of threads used to list directories
+        previous: Snapshots of the previous scan; directories whose mtime is
+            unchanged are not listed again (see _list_directory)
+
+    Yields:
+        Tuple of (directory path, mtime_ns, (entry, media type) pairs or None
+        if unchanged, subdirectory paths)
+    """
+    if max_workers <= 1:
+        stack = [directory]
+        while stack:
+            path = stack.pop()
+            mtime_ns, files, subdirs = _list_directory(path, previous)
+            yield path, mtime_ns, files, subdirs
+            # Reverse so subdirectories are visited in listing order
+            stack.extend(reversed(subdirs))
+        return
+
+    listings: Dict[str, Tuple[Optional[int], Optional[List[Tuple[os.DirEntry, str]]], List[str]]] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ScanWorker") as executor:
+        pending = {executor.submit(_list_directory, directory, previous): directory}
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                listing = future.result()
+                listings[path] = listing
+
+                for subdir in listing[2]:
+                    pending[executor.submit(_list_directory, subdir, previous)] = subdir
+
+    # Reassemble the listings in top-down order
+    stack = [directory]
+    while stack:
+        path = stack.pop()
+        mtime_ns, files, subdirs = listings.pop(path)
+        yield path, mtime_ns, files, subdirs
+        stack.extend(reversed(subdirs))
+
+
+def _build_media_info(rel_path: str, media_type: str, st: os.stat_result) -> Dict[str, Any]:
+    """
+    Build the media info dict of a file, with default dimensions.
+
+    Args:
+        rel_path: Path of the file relative to the scanned directory
+        media_type: 'image' or 'video'
+        st: stat() result of the file
+
+    Returns:
+        Dict[str, Any]: Media info dictionary
+    """
+    media_info = {
+        'path': rel_path,
+        'mtime': st.st_mtime,  # Cache mtime for fast sorting
+        'media_type': media_type,  # 'image' or 'video', so callers don't re-parse the path
+    }
+
+    # Fast defaults without reading files. Videos use a separate thumbnail
+    # generation logic, images are served directly from `/media/`
+    if media_type == 'video':
+        media_info['width'] = DEFAULT_VIDEO_WIDTH
+        media_info['height'] = DEFAULT_VIDEO_HEIGHT
+        media_info['thumbnail'] = _THUMBNAIL_URL_PREFIX + rel_path
+    else:
+        media_info['width'] = DEFAULT_IMAGE_WIDTH
+        media_info['height'] = DEFAULT_IMAGE_HEIGHT
+        media_info['thumbnail'] = _MEDIA_URL_PREFIX + rel_path
+
+    return media_info
+
+
+def _iter_scan(directory: str, previous: Optional[Dict[str, _DirSnapshot]] = None,
+               snapshots: Optional[Dict[str, _DirSnapshot]] = None
+               ) -> Iterator[Tuple[Dict[str, Any], Optional[os.stat_result]]]:
+    """
+    Recursively yield the media files below a directory, one at a time.
+
+    Items carry default dimensions; reading the real ones is up to the caller.
+    When snapshots of a previous scan are given, directories whose mtime is
+    unchanged are not listed again (see _list_directory). Editing a file in
+    place does not touch its directory's mtime, though, so each of their
+    previous items is still stat'ed and only reused as it is while the file's
+    mtime and size match; otherwise a fresh item is built.
+
+    Args:
+        directory: Path to the directory to scan
+        previous: Snapshots of the previous scan, or None to skip mtime tracking
+        snapshots: Receives the snapshot of every directory walked, if given
+
+    Yields:
+        Tuple of (media info dict, stat result of the file or None for items
+        reused unchanged from the previous scan)
+    """
     scanned_files = 0
     skipped_files = 0
     errors = 0
+    media_files = 0
+    reused_dirs = 0
+    reused_files = 0
 
     logger.info(f"Starting directory scan: {directory}")
 
+    # Entry paths all start with the scanned directory, so relative paths can
+    # be sliced off instead of calling os.path.relpath() per file
+    seps = (os.sep, os.altsep) if os.altsep else (os.sep,)
+    root_prefix = directory if directory.endswith(seps) else directory + os.sep
+    prefix_len = len(root_prefix)
+
     try:
-        for root, _, files in os.walk(directory):
-            for file in files:
+        for path, mtime_ns, entries, subdirs in _scandir_walk(directory, _scan_threads, previous):
+            if entries is None:
+                # No entry added or removed here: keep the items of files
+                # that were not modified in place either
+                reused_dirs += 1
+                dir_media = []
+                for media_info, signature in previous[path][1]:
+                    rel_path = media_info['path']
+                    full_path = root_prefix + rel_path
+                    try:
+                        st = os.stat(full_path)
+                    except OSError:
+                        # Gone without the directory changing (e.g. the target
+                        # of a symlink was removed)
+                        logger.warning(f"File not found (broken symlink?): {full_path}")
+                        errors += 1
+                        continue
+
+                    file_signature = (st.st_mtime_ns, st.st_size)
+                    if file_signature == signature:
+                        reused_files += 1
+                        changed_st = None
+                    elif _is_readable(st, full_path):
+                        media_info = _build_media_info(rel_path, media_info['media_type'], st)
+                        changed_st = st
+                    else:
+                        logger.warning(f"File not readable (permission denied): {full_path}")
+                        errors += 1
+                        continue
+
+                    dir_media.append((media_info, file_signature))
+                    media_files += 1
+                    yield media_info, changed_st
+
+                if snapshots is not None:
+                    snapshots[path] = (mtime_ns, dir_media, subdirs)
+                continue
+
+            dir_media = []
+            for entry, media_type in entries:
+                file = entry.name
                 scanned_files += 1
 
                 try:
-                    # Validate file extension
-                    if not validate_media_extension(file):
+                    # Classified while listing (also filters non-media files)
+                    if media_type == 'unknown':
                         skipped_files += 1
                         continue
 
-                    full_path = os.path.join(root, file)
+                    full_path = entry.path
 
-                    # Validate that the file is accessible
-                    if not os.path.exists(full_path):
+                    # stat() follows symlinks and is cached on the entry, so a
+                    # single call both detects broken symlinks and gives the mtime
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
                         logger.warning(f"File not found (broken symlink?): {full_path}")
                         errors += 1
                         continue
 
                     # Check if we can read the file
-                    if not os.access(full_path, os.R_OK):
+                    if not _is_readable(st, full_path):
                         logger.warning(f"File not readable (permission denied): {full_path}")
                         errors += 1
                         continue
 
-                    rel_path = os.path.relpath(full_path, start=directory)
-
-                    # Get file modification time for sorting
-                    try:
-                        mtime = os.path.getmtime(full_path)
-                    except (OSError, IOError):
-                        mtime = 0  # Default if we can't read mtime
-
-                    # Build media info dict
-                    media_info = {
-                        'path': rel_path,
-                        'mtime': mtime,  # Cache mtime for fast sorting
-                    }
-
-                    # Get media dimensions if requested (slower but more accurate)
-                    if include_dimensions:
-                        width, height = get_media_dimensions(full_path)
-                        media_info['width'] = width
-                        media_info['height'] = height
-                    else:
-                        # Use fast defaults without reading files
-                        if file.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv')):
-                            media_info['width'] = DEFAULT_VIDEO_WIDTH
-                            media_info['height'] = DEFAULT_VIDEO_HEIGHT
-                        else:
-                            media_info['width'] = DEFAULT_IMAGE_WIDTH
-                            media_info['height'] = DEFAULT_IMAGE_HEIGHT
-
-                    # For videos, use a separate thumbnail generation logic
-                    if file.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv')):
-                        media_info['thumbnail'] = f"/thumbnail/{rel_path}"
-                    else:
-                        # For images, prepend `/media/` to the path for direct serving
-                        media_info['thumbnail'] = f"/media/{rel_path}"
-
-                    media.append(media_info)
+                    rel_path = full_path[prefix_len:]
+                    media_info = _build_media_info(rel_path, media_type, st)
+                    dir_media.append((media_info, (st.st_mtime_ns, st.st_size)))
 
                 except PermissionError:
                     logger.warning(f"Permission denied accessing file: {file}")
@@ -207,6 +502,12 @@ def scan_directory(directory: str, use_cache: bool = True, include_dimensions: b
                     errors += 1
                     continue
 
+                media_files += 1
+                yield media_info, st
+
+            if snapshots is not None:
+                snapshots[path] = (mtime_ns, dir_media, subdirs)
+
     except PermissionError as e:
         logger.error(f"Permission denied accessing directory: {directory}")
         raise
@@ -214,20 +515,199 @@ def scan_directory(directory: str, use_cache: bool = True, include_dimensions: b
         logger.error(f"Error scanning directory {directory}: {e}")
         raise
 
-    logger.info(f"Scan complete: {len(media)} media files found, "
-                f"{scanned_files} files scanned, {skipped_files} skipped, {errors} errors")
+    logger.info(f"Scan complete: {media_files} media files found, "
+                f"{scanned_files} files scanned, {skipped_files} skipped, {errors} errors, "
+                f"{reused_dirs} unchanged directories reused ({reused_files} files unchanged)")
+
 
-    # Cache the result
-    if use_cache and media:
+def scan_directory(directory: str, use_cache: bool = True, include_dimensions: bool = True) -> List[Dict[str, Any]]:
+    """
+    Recursively scans a directory for media files (images and videos).
+    Returns a list of dictionaries containing file info including dimensions.
+
+    Uses caching to improve performance on repeated scans. Once a cached
+    result expires, the tree is revalidated rather than rescanned: only
+    directories whose mtime changed since the last scan are listed again,
+    and in all other directories the media items of files whose mtime and
+    size are unchanged are reused. Requests that
+    miss the cache while the same scan is running wait for its result.
+
+    The returned list is shared with the cache and other callers and must
+    not be modified; sort or filter a copy instead.
+
+    Args:
+        directory: Path to the directory to scan
+        use_cache: Whether to use cache (default: True)
+        include_dimensions: Whether to extract dimensions (default: True, set False for faster scanning)
+
+    Returns:
+        List[Dict[str, Any]]: List of dictionaries with keys:
+            - path: relative path to media file
+            - media_type: 'image' or 'video'
+            - thumbnail: URL path to thumbnail
+            - width: media width in pixels (if include_dimensions=True, otherwise default values)
+            - height: media height in pixels (if include_dimensions=True, otherwise default values)
+    """
+    # Try to get from cache first
+    cache_key = None
+    if use_cache:
         # Use different cache keys for with/without dimensions
         cache_suffix = CACHE_SUFFIX_WITH_DIMS if include_dimensions else CACHE_SUFFIX_NO_DIMS
-        cache_key = cache_key_for_directory(directory) + cache_suffix
-        directory_cache.set(cache_key, media)
+        cache_key = _versioned_cache_key(directory, cache_suffix)
+        cached_result = get_directory_cache().get(cache_key) if cache_key else None
+        if cached_result is not None:
+            logger.info(f"Using cached scan result for: {directory} ({len(cached_result)} files, dims={include_dimensions})")
+            return cached_result
+
+    if not cache_key:
+        return _scan_uncached(directory, use_cache, include_dimensions, None)
+
+    with _inflight_scans_lock:
+        future = _inflight_scans.get(cache_key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _inflight_scans[cache_key] = future
+
+    if not owner:
+        logger.debug(f"Waiting for scan already in progress: {directory}")
+        return future.result()
+
+    try:
+        media = _scan_uncached(directory, use_cache, include_dimensions, cache_key)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(media)
+        return media
+    finally:
+        with _inflight_scans_lock:
+            del _inflight_scans[cache_key]
+
+
+def _scan_uncached(directory: str, use_cache: bool, include_dimensions: bool,
+                   cache_key: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Scan a directory tree and cache the result (see scan_directory).
+
+    Args:
+        directory: Path to the directory to scan
+        use_cache: Whether to reuse and store per-directory snapshots
+        include_dimensions: Whether to extract dimensions
+        cache_key: Cache key to store the result under, or None
+
+    Returns:
+        List[Dict[str, Any]]: Media info dictionaries
+    """
+    media = []
+    # Items waiting for their dimensions, and the matching (path, thumbnail, stat) tasks
+    dimension_items = []
+    dimension_tasks = []
+
+    # Snapshots of the previous scan of this tree, and the ones built now
+    snapshot_key = (directory, include_dimensions)
+    previous = _scan_snapshots.get(snapshot_key, {}) if use_cache else None
+    snapshots: Optional[Dict[str, _DirSnapshot]] = {} if use_cache else None
+
+    for media_info, st in _iter_scan(directory, previous, snapshots):
+        media.append(media_info)
+
+        # Real dimensions (slower but more accurate) are read after the walk,
+        # in parallel; items reused from the previous scan already have them
+        if include_dimensions and st is not None:
+            dimension_items.append(media_info)
+            dimension_tasks.append((os.path.join(directory, media_info['path']), None, st))
+
+    if dimension_tasks:
+        for media_info, (width, height) in zip(dimension_items, read_dimensions(dimension_tasks)):
+            media_info['width'] = width
+            media_info['height'] = height
+
+    if snapshots is not None:
+        _scan_snapshots[snapshot_key] = snapshots
+
+    # Cache the result (keyed on the mtime seen before scanning)
+    if cache_key and media:
+        get_directory_cache().set(cache_key, media)
         logger.debug(f"Cached scan result for: {directory} (dims={include_dimensions})")
 
     return media
 
 
+def _add_folder_prefix(item: Dict[str, Any], folder_prefix: str) -> None:
+    """
+    Make a media item's path and thumbnail URL relative to the media root.
+
+    Args:
+        item: Media info dictionary with a path relative to its folder (modified in-place)
+        folder_prefix: Folder path relative to the media root, ending in a separator
+    """
+    path = folder_prefix + item['path']
+
+    if item['thumbnail'].startswith(_THUMBNAIL_URL_PREFIX):
+        item['thumbnail'] = _THUMBNAIL_URL_PREFIX + path
+    else:
+        item['thumbnail'] = _MEDIA_URL_PREFIX + path
+
+    item['path'] = path
+
+
+def get_basename_index(media_root: str) -> Dict[str, List[str]]:
+    """
+    Get an index of every media file below the media root by file name.
+
+    Built from the (cached) scan of the media root, so looking a name up
+    costs one dict hit instead of walking the whole tree. The index is
+    rebuilt whenever the scanner returns a new scan result.
+
+    Args:
+        media_root: Root media directory
+
+    Returns:
+        Dict[str, List[str]]: File name -> paths relative to media_root
+    """
+    media = scan_directory(media_root, use_cache=True, include_dimensions=False)
+
+    cached = _basename_indexes.get(media_root)
+    if cached is not None and cached[0] is media:
+        return cached[1]
+
+    index: Dict[str, List[str]] = {}
+    for item in media:
+        path = item['path']
+        index.setdefault(os.path.basename(path), []).append(path)
+
+    _basename_indexes[media_root] = (media, index)
+    return index
+
+
+def iter_media_files(media_root: str, folder_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the media files below a folder one at a time, without caching.
+
+    For callers that only need a single pass over the files (such as picking
+    a random sample), this avoids building the folder's whole media list.
+    Items have default dimensions and, like get_sorted_files, paths relative
+    to media_root.
+
+    Args:
+        media_root: Root media directory
+        folder_path: Specific folder to scan
+
+    Yields:
+        Dict[str, Any]: Media info dictionary with path, thumbnail, width, height
+    """
+    folder_prefix = None
+    if folder_path != media_root:
+        folder_prefix = os.path.relpath(folder_path, start=media_root) + os.sep
+
+    for media_info, _ in _iter_scan(folder_path):
+        if folder_prefix:
+            _add_folder_prefix(media_info, folder_prefix)
+        yield media_info
+
+
 def get_sorted_files(media_root: str, folder_path: str, sort_by: str = "default", use_cache: bool = True, include_dimensions: bool = True) -> List[Dict[str, Any]]:
     """
     Get files from a folder and optionally sort them.
@@ -252,11 +732,12 @@ def get_sorted_files(media_root: str, folder_path: str, sort_by: str = "default"
     logger.info(f"Getting sorted files from {folder_path} with sort_by={sort_by}")
 
     # Check sorted cache first (except for random which should always be different)
+    cache_key = None
     if use_cache and sort_by != "random":
         cache_suffix = CACHE_SUFFIX_WITH_DIMS if include_dimensions else CACHE_SUFFIX_NO_DIMS
         cache_suffix += f"_sort_{sort_by}"  # Include sort type in cache key
-        cache_key = cache_key_for_directory(folder_path) + cache_suffix
-        cached_result = directory_cache.get(cache_key)
+        cache_key = _versioned_cache_key(folder_path, cache_suffix)
+        cached_result = get_directory_cache().get(cache_key) if cache_key else None
         if cached_result is not None:
             logger.info(f"Using cached sorted result for: {folder_path} (sort={sort_by}, {len(cached_result)} files)")
             return cached_result
@@ -272,11 +753,12 @@ def get_sorted_files(media_root: str, folder_path: str, sort_by: str = "default"
             random.shuffle(media)
             logger.debug(f"Randomized {len(media)} media files")
         elif sort_by == "new":
-            # Use cached mtime for fast sorting (no filesystem calls!)
+            # Use cached mtime for fast sorting (no filesystem calls!);
+            # itemgetter keeps key extraction in C instead of a Python lambda
             try:
                 media = sorted(
                     media,
-                    key=lambda x: x.get('mtime', 0),
+                    key=itemgetter('mtime'),
                     reverse=True
                 )
                 logger.debug(f"Sorted {len(media)} media files by cached modification time")
@@ -288,30 +770,20 @@ def get_sorted_files(media_root: str, folder_path: str, sort_by: str = "default"
         if folder_path != media_root:
             rel_folder = os.path.relpath(folder_path, start=media_root)
 
-            # Prepend the folder path to the relative paths
-            adjusted_media = []
+            # Prepend the folder path to the relative paths. With caching on,
+            # the items belong to the cached scan result and must be copied;
+            # otherwise nothing else holds them and they are updated in place
+            folder_prefix = rel_folder + os.sep
+            if use_cache:
+                media = [item.copy() for item in media]
             for item in media:
-                adjusted_item = item.copy()
-                path = item['path']
-                thumb_path = item['thumbnail']
-
-                if thumb_path.startswith('/thumbnail/'):
-                    adjusted_item['thumbnail'] = f"/thumbnail/{os.path.join(rel_folder, path)}"
-                else:
-                    adjusted_item['thumbnail'] = f"/media/{os.path.join(rel_folder, path)}"
-
-                adjusted_item['path'] = os.path.join(rel_folder, path)
-                adjusted_media.append(adjusted_item)
+                _add_folder_prefix(item, folder_prefix)
 
-            media = adjusted_media
             logger.debug(f"Adjusted media paths for subfolder: {rel_folder}")
 
         # Cache the sorted result (except for random)
-        if use_cache and sort_by != "random" and media:
-            cache_suffix = CACHE_SUFFIX_WITH_DIMS if include_dimensions else CACHE_SUFFIX_NO_DIMS
-            cache_suffix += f"_sort_{sort_by}"
-            cache_key = cache_key_for_directory(folder_path) + cache_suffix
-            directory_cache.set(cache_key, media)
+        if cache_key and media:
+            get_directory_cache().set(cache_key, media)
             logger.debug(f"Cached sorted result for: {folder_path} (sort={sort_by})")
 
         return media
@@ -5,31 +5,344 @@ This module contains functions for generating thumbnails
 for both image and video files.
 """
 
+import gc
 import os
-from typing import Optional
-from PIL import Image
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, Iterator, Optional
+from PIL import Image, ImageOps, __version__ as PILLOW_VERSION
 from py_home_gallery.utils.security import get_safe_path
 from py_home_gallery.utils.logger import get_logger
+from py_home_gallery.utils.ffmpeg import get_video_duration, extract_frame
+from py_home_gallery.utils.thumbnail_optimizer import optimize_thumbnail
+from py_home_gallery.media.utils import get_thumbnail_path, find_thumbnail, is_image, add_thumbnail_file
+from py_home_gallery.constants import (
+    DEFAULT_THUMBNAIL_FILTER,
+    THUMBNAIL_WAIT_TIMEOUT,
+    THUMBNAIL_JPEG_QUALITY,
+    MOVIEPY_GC_INTERVAL,
+)
 
 logger = get_logger(__name__)
 
 try:
-    # Try the newer style import (may work on newer versions)
-    from moviepy.editor import VideoFileClip
-    logger.info("Using moviepy.editor import")
+    # Optional: in-process frame grabs without an ffmpeg subprocess
+    import av
 except ImportError:
+    av = None
+
+# Resampling filters by --thumbnail-filter name
+_RESAMPLE_FILTERS = {
+    'lanczos': Image.Resampling.LANCZOS,
+    'bicubic': Image.Resampling.BICUBIC,
+    'bilinear': Image.Resampling.BILINEAR,
+    'nearest': Image.Resampling.NEAREST,
+}
+# Filter used to shrink images into thumbnails (configured via configure_thumbnails)
+_resample = _RESAMPLE_FILTERS[DEFAULT_THUMBNAIL_FILTER]
+# Modes saved to JPEG as-is; anything else is converted to RGB
+_JPEG_MODES = frozenset({'L', 'RGB'})
+# Transparent areas of images are flattened onto this color
+_JPEG_BACKGROUND = (255, 255, 255)
+# Modes Pillow can only resize with NEAREST (ignoring the configured filter)
+_NEAREST_ONLY_MODES = frozenset({'1', 'P'})
+
+# Thumbnails being generated right now, by thumbnail path; other callers
+# wait on the future instead of generating the same thumbnail again
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# moviepy's VideoFileClip, imported on first use (see _get_video_file_clip)
+_VideoFileClip = None
+# Clips opened through the moviepy fallback (drives the periodic gc.collect)
+_moviepy_clips = 0
+_moviepy_clips_lock = threading.Lock()
+
+def configure_thumbnails(resample_filter: str = DEFAULT_THUMBNAIL_FILTER) -> None:
+    """
+    Configure how thumbnails are resampled.
+
+    Should be called once during application startup with config values.
+    Unknown filter names are logged and the default filter is used.
+
+    Args:
+        resample_filter: Resampling filter name ('lanczos', 'bicubic',
+            'bilinear' or 'nearest')
+    """
+    global _resample
+
+    if resample_filter not in _RESAMPLE_FILTERS:
+        logger.warning(f"Unknown thumbnail filter '{resample_filter}', using {DEFAULT_THUMBNAIL_FILTER}")
+        resample_filter = DEFAULT_THUMBNAIL_FILTER
+
+    _resample = _RESAMPLE_FILTERS[resample_filter]
+    logger.info(f"Thumbnail resampling filter: {resample_filter} (Pillow {PILLOW_VERSION})")
+
+
+def _shrink(image: Image.Image, width: int, height: int) -> None:
+    """
+    Shrink an image in place to fit within width x height.
+
+    Image.thumbnail() first box-reduces a full-resolution frame (e.g.
+    1920x1080) by an integer factor to no less than twice the target size
+    (Pillow's default reducing_gap of 2.0), so the configured filter only
+    convolves a few hundred thousand pixels instead of every source pixel.
+    The result is visually the same as filtering the full frame.
+
+    Args:
+        image: Image to shrink (modified in-place)
+        width: Maximum thumbnail width
+        height: Maximum thumbnail height
+    """
+    image.thumbnail((width, height), _resample)
+
+
+def _save_thumbnail(image: Image.Image, thumbnail_path: str) -> None:
+    """
+    Save a thumbnail as a progressive JPEG.
+
+    JPEG encodes a photo or video frame several times faster than optimized
+    PNG and produces a much smaller file. Transparency is flattened onto a
+    white background since JPEG has no alpha channel.
+
+    Args:
+        image: Thumbnail-sized image
+        thumbnail_path: Path where the thumbnail should be saved
+    """
+    if image.mode not in _JPEG_MODES:
+        if 'A' in image.getbands() or 'transparency' in image.info:
+            rgba = image.convert('RGBA')
+            image = Image.new('RGB', rgba.size, _JPEG_BACKGROUND)
+            image.paste(rgba, mask=rgba.getchannel('A'))
+        else:
+            image = image.convert('RGB')
+
+    image.save(thumbnail_path, 'JPEG', quality=THUMBNAIL_JPEG_QUALITY,
+               optimize=True, progressive=True)
+
+
+def generate_image_thumbnail(image_path: str, thumbnail_path: str, width: int = 300, height: int = 200) -> bool:
+    """
+    Generate a thumbnail for an image file.
+
+    Before decoding, draft() asks the JPEG decoder for a reduced size (the
+    largest 1/2, 1/4 or 1/8 scale still at least twice the thumbnail size),
+    so libjpeg downscales in the DCT domain instead of decoding every pixel.
+    The final resize then uses the configured filter. draft() is a no-op
+    for other formats.
+
+    Args:
+        image_path: Path to the image file
+        thumbnail_path: Path where the thumbnail should be saved
+        width: Thumbnail width (default: 300)
+        height: Thumbnail height (default: 200)
+
+    Returns:
+        bool: True if thumbnail was created successfully, False otherwise
+    """
     try:
-        # Try the older/alternative style import
-        from moviepy import VideoFileClip
-        logger.info("Using direct moviepy import")
-    except ImportError:
-        # Neither import style worked
-        logger.error("Failed to import VideoFileClip. Please install moviepy: pip install moviepy>=1.0.0")
-        raise ImportError("Failed to import VideoFileClip. Please install moviepy: pip install moviepy>=1.0.0")
+        logger.info(f"Generating thumbnail for: {image_path}")
+
+        # Ensure the directory exists
+        thumbnail_dir = os.path.dirname(thumbnail_path)
+        if thumbnail_dir and not os.path.isdir(thumbnail_dir):
+            os.makedirs(thumbnail_dir, exist_ok=True)
+
+        with Image.open(image_path) as img:
+            img.draft('RGB', (width * 2, height * 2))
+            # Match how browsers show the original (EXIF orientation)
+            image = ImageOps.exif_transpose(img)
+            # Palette (e.g. GIF) and bilevel images would be resized with
+            # NEAREST; expand them so the configured filter is applied
+            if image.mode in _NEAREST_ONLY_MODES:
+                if image.mode == 'P' and 'transparency' in image.info:
+                    image = image.convert('RGBA')
+                else:
+                    image = image.convert('RGB' if image.mode == 'P' else 'L')
+            _shrink(image, width, height)
+            _save_thumbnail(image, thumbnail_path)
+
+        logger.info(f"Successfully generated thumbnail: {thumbnail_path}")
+        return True
+
+    except MemoryError:
+        logger.error(f"Out of memory while generating thumbnail for: {image_path}")
+        return False
+    except OSError as e:
+        logger.error(f"OS error generating thumbnail for {image_path}: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"Unexpected error generating thumbnail for {image_path}: {e}")
+        return False
+
+
+def _generate_with_pyav(video_path: str, thumbnail_path: str, width: int, height: int) -> bool:
+    """
+    Generate a thumbnail by decoding one frame from the middle with PyAV.
+
+    Runs inside the process (no ffmpeg subprocess): the container is seeked
+    to the keyframe before the middle of the video and only the frames from
+    there to the first decoded one are read.
+
+    Args:
+        video_path: Path to the video file
+        thumbnail_path: Path where the thumbnail should be saved
+        width: Thumbnail width
+        height: Thumbnail height
+
+    Returns:
+        bool: True if thumbnail was created successfully, False otherwise
+    """
+    container = av.open(video_path)
+
+    try:
+        if not container.streams.video:
+            logger.warning(f"No video stream found: {video_path}")
+            return False
+        stream = container.streams.video[0]
+
+        # Seek to the middle, in stream time base units when the stream knows
+        # its duration and in microseconds (container time base) otherwise
+        if stream.duration:
+            middle = (stream.start_time or 0) + stream.duration // 2
+            container.seek(middle, backward=True, any_frame=False, stream=stream)
+        elif container.duration:
+            container.seek(container.duration // 2, backward=True, any_frame=False)
+
+        for frame in container.decode(stream):
+            image = frame.to_image()
+            _shrink(image, width, height)
+            _save_thumbnail(image, thumbnail_path)
+            return True
+
+        return False
+    finally:
+        container.close()
+
+
+def _get_video_file_clip():
+    """
+    Import moviepy's VideoFileClip the first time the moviepy fallback runs.
+
+    moviepy pulls in imageio, numpy and friends, which is a noticeable part
+    of startup and is never needed while ffmpeg or PyAV handle every video.
+
+    Returns:
+        VideoFileClip class
+
+    Raises:
+        ImportError: If moviepy is not installed
+    """
+    global _VideoFileClip
+
+    if _VideoFileClip is None:
+        try:
+            # Try the newer style import (may work on newer versions)
+            from moviepy.editor import VideoFileClip
+            logger.info("Using moviepy.editor import")
+        except ImportError:
+            try:
+                # Try the older/alternative style import
+                from moviepy import VideoFileClip
+                logger.info("Using direct moviepy import")
+            except ImportError:
+                # Neither import style worked
+                logger.error("Failed to import VideoFileClip. Please install moviepy: pip install moviepy>=1.0.0")
+                raise ImportError("Failed to import VideoFileClip. Please install moviepy: pip install moviepy>=1.0.0")
+        _VideoFileClip = VideoFileClip
+
+    return _VideoFileClip
+
+
+@contextmanager
+def _managed_clip(video_path: str) -> Iterator:
+    """
+    Open a video with moviepy and release everything it holds afterwards.
+
+    The clip is opened without audio, so no second ffmpeg reader process is
+    started. On exit the clip is closed (terminating its ffmpeg process) and
+    its reader and frame function are dropped, so a clip object that is
+    still referenced somewhere doesn't keep decode buffers alive. Every
+    MOVIEPY_GC_INTERVAL clips a full garbage collection frees whatever
+    moviepy left in reference cycles.
+
+    Args:
+        video_path: Path to the video file
+
+    Yields:
+        VideoFileClip: The opened clip
+    """
+    global _moviepy_clips
+
+    clip = _get_video_file_clip()(video_path, audio=False)
+    try:
+        yield clip
+    finally:
+        try:
+            clip.close()
+        except Exception as e:
+            logger.warning(f"Error closing video clip: {e}")
+        for attr in ('reader', 'audio', 'make_frame'):
+            try:
+                delattr(clip, attr)
+            except AttributeError:
+                pass
+        del clip
+
+        with _moviepy_clips_lock:
+            _moviepy_clips += 1
+            collect = _moviepy_clips % MOVIEPY_GC_INTERVAL == 0
+        if collect:
+            gc.collect()
+
+
+def _generate_with_moviepy(video_path: str, thumbnail_path: str, width: int, height: int) -> bool:
+    """
+    Generate a thumbnail by decoding the middle frame through moviepy.
+
+    Slower than the ffmpeg seek path because moviepy decodes up to the
+    requested timestamp, so it is only used as a fallback.
+
+    Args:
+        video_path: Path to the video file
+        thumbnail_path: Path where the thumbnail should be saved
+        width: Thumbnail width
+        height: Thumbnail height
+
+    Returns:
+        bool: True if thumbnail was created successfully, False otherwise
+    """
+    # The clip is closed as soon as the frame has been read
+    with _managed_clip(video_path) as clip:
+        # Validate clip duration
+        if clip.duration <= 0:
+            logger.warning(f"Video has invalid duration: {video_path}")
+            return False
+
+        # Take a frame from the middle of the video
+        frame_time = min(clip.duration / 2, clip.duration - 0.1)  # Avoid end of video
+        frame = clip.get_frame(frame_time)
+
+    # Save the frame as a thumbnail. Pillow keeps RGB as 4 bytes per
+    # pixel, so fromarray (like frombuffer) copies the frame; drop the
+    # array before resizing so both full-size buffers aren't held at once
+    image = Image.fromarray(frame)
+    del frame
+    _shrink(image, width, height)
+    _save_thumbnail(image, thumbnail_path)
+    return True
+
 
 def generate_video_thumbnail(video_path: str, thumbnail_path: str, width: int = 300, height: int = 200) -> bool:
     """
     Generate a thumbnail for a video file.
+
+    The frame is grabbed with a single ffmpeg call that seeks to the middle of
+    the video before opening the input, so only one keyframe is decoded and
+    ffmpeg writes the scaled image itself. When ffprobe/ffmpeg cannot handle
+    the file, PyAV (if installed) grabs the frame in-process with the same
+    keyframe seek, and moviepy is the last resort.
     
     Args:
         video_path: Path to the video file
@@ -40,51 +353,55 @@ def generate_video_thumbnail(video_path: str, thumbnail_path: str, width: int =
     Returns:
         bool: True if thumbnail was created successfully, False otherwise
     """
-    clip = None
-    
     try:
-        # Validate that video file exists
-        if not os.path.exists(video_path):
+        # Validate that video file exists (one stat also gives the size)
+        try:
+            file_size = os.stat(video_path).st_size
+        except FileNotFoundError:
             logger.error(f"Video file not found: {video_path}")
             return False
         
         logger.info(f"Generating thumbnail for: {video_path}")
 
         # Log file size for monitoring
-        file_size_mb = os.path.getsize(video_path) / (1024 * 1024)
+        file_size_mb = file_size / (1024 * 1024)
         logger.debug(f"Video file size: {file_size_mb:.2f}MB")
-        
-        # Open the video file
-        clip = VideoFileClip(video_path)
-        
-        # Validate clip duration
-        if clip.duration <= 0:
-            logger.warning(f"Video has invalid duration: {video_path}")
-            clip.close()
-            return False
-        
-        # Take a frame from the middle of the video
-        frame_time = min(clip.duration / 2, clip.duration - 0.1)  # Avoid end of video
-        frame = clip.get_frame(frame_time)
-        
-        # Close the video to free resources
-        clip.close()
-        clip = None
 
-        # Save the frame as a thumbnail
-        image = Image.fromarray(frame)
-        image.thumbnail((width, height), Image.Resampling.LANCZOS)
-        
         # Ensure the directory exists
         thumbnail_dir = os.path.dirname(thumbnail_path)
-        if thumbnail_dir:
+        if thumbnail_dir and not os.path.isdir(thumbnail_dir):
             os.makedirs(thumbnail_dir, exist_ok=True)
-        
-        # Save with error handling
-        image.save(thumbnail_path, 'PNG', optimize=True)
-        
-        logger.info(f"Successfully generated thumbnail: {thumbnail_path}")
-        return True
+
+        duration = get_video_duration(video_path)
+        if duration is not None:
+            # Validate duration
+            if duration <= 0:
+                logger.warning(f"Video has invalid duration: {video_path}")
+                return False
+
+            # Take a frame from the middle of the video
+            frame_time = min(duration / 2, duration - 0.1)  # Avoid end of video
+            if extract_frame(video_path, thumbnail_path, frame_time, width, height):
+                logger.info(f"Successfully generated thumbnail: {thumbnail_path}")
+                # ffmpeg writes baseline JPEGs with default Huffman tables;
+                # Pillow output is already optimized and progressive
+                optimize_thumbnail(thumbnail_path)
+                return True
+
+        if av is not None:
+            logger.info(f"ffmpeg frame grab unavailable, falling back to PyAV: {video_path}")
+            try:
+                if _generate_with_pyav(video_path, thumbnail_path, width, height):
+                    logger.info(f"Successfully generated thumbnail: {thumbnail_path}")
+                    return True
+            except Exception as e:
+                logger.warning(f"PyAV could not grab a frame from {video_path}: {e}")
+
+        logger.info(f"ffmpeg frame grab unavailable, falling back to moviepy: {video_path}")
+        if _generate_with_moviepy(video_path, thumbnail_path, width, height):
+            logger.info(f"Successfully generated thumbnail: {thumbnail_path}")
+            return True
+        return False
     
     except MemoryError:
         logger.error(f"Out of memory while generating thumbnail for: {video_path}")
@@ -98,13 +415,66 @@ def generate_video_thumbnail(video_path: str, thumbnail_path: str, width: int =
     except Exception as e:
         logger.error(f"Unexpected error generating thumbnail for {video_path}: {e}")
         return False
+
+
+def generate_thumbnail(media_path: str, thumbnail_path: str) -> bool:
+    """
+    Generate the thumbnail for a media file, once per thumbnail path at a time.
+
+    Images are resized by Pillow, videos go through generate_video_thumbnail.
+    When the same thumbnail is already being generated (by another request
+    or the background worker), this waits for that result instead of
+    decoding the file a second time and writing to the same output file.
+    A thumbnail that already exists (non-empty) is kept as it is.
+
+    Args:
+        media_path: Full path to the image or video file
+        thumbnail_path: Path where the thumbnail should be saved
+
+    Returns:
+        bool: True if thumbnail was created successfully, False otherwise
+    """
+    with _inflight_lock:
+        future = _inflight.get(thumbnail_path)
+        owner = future is None
+        if owner:
+            future = Future()
+            _inflight[thumbnail_path] = future
+
+    if not owner:
+        logger.debug(f"Waiting for thumbnail already being generated: {thumbnail_path}")
+        try:
+            return future.result(timeout=THUMBNAIL_WAIT_TIMEOUT)
+        except FutureTimeoutError:
+            logger.warning(f"Timed out waiting for thumbnail: {thumbnail_path}")
+            return False
+
+    generated = False
+    try:
+        # A queued job may find its thumbnail already written by a request;
+        # an empty file is left over from an interrupted generation
+        try:
+            if os.stat(thumbnail_path).st_size > 0:
+                generated = True
+                return generated
+            logger.warning(f"Removing corrupted thumbnail: {thumbnail_path}")
+            os.remove(thumbnail_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error removing corrupted thumbnail: {e}")
+
+        if is_image(media_path):
+            generated = generate_image_thumbnail(media_path, thumbnail_path)
+        else:
+            generated = generate_video_thumbnail(media_path, thumbnail_path)
+        if generated:
+            add_thumbnail_file(thumbnail_path)
+        return generated
     finally:
-        # Ensure clip is closed even if an error occurred
-        if clip is not None:
-            try:
-                clip.close()
-            except Exception as e:
-                logger.warning(f"Error closing video clip: {e}")
+        with _inflight_lock:
+            del _inflight[thumbnail_path]
+        future.set_result(generated)
 
 
 def ensure_thumbnail_exists(media_root: str, thumbnail_dir: str, filename: str, placeholder_url: Optional[str] = None) -> str:
@@ -135,37 +505,16 @@ def ensure_thumbnail_exists(media_root: str, thumbnail_dir: str, filename: str,
             logger.warning(f"Media file not found for thumbnail: {video_path}")
             return placeholder_url or ""
         
-        # Preserve directory structure by using the full relative path
-        # Replace path separators with a safe character to avoid issues with nested directories
-        safe_filename = filename.replace('\\', '_').replace('/', '_')
-        
-        # Limit filename length to avoid filesystem issues
-        if len(safe_filename) > 200:
-            # Use hash for very long filenames
-            import hashlib
-            file_hash = hashlib.md5(safe_filename.encode()).hexdigest()
-            extension = os.path.splitext(safe_filename)[1]
-            safe_filename = f"{file_hash}{extension}"
-        
-        thumbnail_path = os.path.join(thumbnail_dir, f"{safe_filename}.png")
-        
         # If thumbnail already exists and is valid, return its path
-        if os.path.exists(thumbnail_path):
-            # Verify thumbnail is not corrupted (has size > 0)
-            if os.path.getsize(thumbnail_path) > 0:
-                logger.debug(f"Using existing thumbnail: {thumbnail_path}")
-                return thumbnail_path
-            else:
-                # Remove corrupted thumbnail
-                logger.warning(f"Removing corrupted thumbnail: {thumbnail_path}")
-                try:
-                    os.remove(thumbnail_path)
-                except Exception as e:
-                    logger.error(f"Error removing corrupted thumbnail: {e}")
-        
-        # Try to generate the thumbnail
+        existing_thumbnail = find_thumbnail(thumbnail_dir, filename)
+        if existing_thumbnail:
+            logger.debug(f"Using existing thumbnail: {existing_thumbnail}")
+            return existing_thumbnail
+
+        # Try to generate the thumbnail (concurrent requests share one generation)
+        thumbnail_path = get_thumbnail_path(thumbnail_dir, filename)
         logger.info(f"Attempting to generate thumbnail for: {filename}")
-        if generate_video_thumbnail(video_path, thumbnail_path):
+        if generate_thumbnail(video_path, thumbnail_path):
             return thumbnail_path
         
         # Return placeholder if generation fails
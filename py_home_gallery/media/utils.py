@@ -6,7 +6,61 @@ including file type detection and path handling.
 """
 
 import os
-from typing import Literal
+import random
+import hashlib
+import threading
+from functools import lru_cache
+from typing import Dict, List, Literal, Optional, Set, Tuple
+from py_home_gallery.constants import (
+    IMAGE_EXTENSIONS,
+    VIDEO_EXTENSIONS,
+    THUMBNAIL_EXTENSION,
+    LEGACY_THUMBNAIL_EXTENSION,
+    THUMBNAIL_LOOKUP_CACHE_MAX_ENTRIES,
+    THUMBNAIL_NAME_CACHE_MAX_ENTRIES,
+)
+from py_home_gallery.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Extensions without the leading dot, for O(1) lookups
+_IMAGE_EXTS = frozenset(ext[1:] for ext in IMAGE_EXTENSIONS)
+_VIDEO_EXTS = frozenset(ext[1:] for ext in VIDEO_EXTENSIONS)
+_MEDIA_EXTS = _IMAGE_EXTS | _VIDEO_EXTS
+
+# Flattens path separators in thumbnail names in a single pass
+_SAFE_NAME_TABLE = str.maketrans({'\\': '_', '/': '_'})
+
+# Thumbnails known to exist, by (thumbnail_dir, filename). A valid thumbnail
+# is never rewritten, so only hits are remembered (see forget_thumbnail)
+_found_thumbnails: Dict[Tuple[str, str], str] = {}
+_found_thumbnails_lock = threading.Lock()
+
+# Image files counted as thumbnails by the thumbnail file index
+_THUMBNAIL_FILE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+# Thumbnail files below each thumbnail_dir, as '/'-separated relative paths.
+# Built by one walk on first use and kept current as thumbnails are written,
+# moved or found missing (see sample_thumbnail_files)
+_thumbnail_files: Dict[str, List[str]] = {}
+_thumbnail_file_sets: Dict[str, Set[str]] = {}
+_thumbnail_files_lock = threading.Lock()
+
+
+def _get_extension(filename: str) -> str:
+    """
+    Get the lowercased extension of a filename, without the dot.
+
+    Only the extension is lowercased, so no copy of the full name is made.
+
+    Args:
+        filename: The filename to inspect
+
+    Returns:
+        str: Extension (e.g. 'mp4'), or an empty string if there is none
+    """
+    dot = filename.rfind('.')
+    return filename[dot + 1:].lower() if dot >= 0 else ''
 
 
 def is_image(filename: str) -> bool:
@@ -19,7 +73,7 @@ def is_image(filename: str) -> bool:
     Returns:
         bool: True if the file is an image, False otherwise
     """
-    return filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'))
+    return _get_extension(filename) in _IMAGE_EXTS
 
 
 def is_video(filename: str) -> bool:
@@ -32,7 +86,7 @@ def is_video(filename: str) -> bool:
     Returns:
         bool: True if the file is a video, False otherwise
     """
-    return filename.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv'))
+    return _get_extension(filename) in _VIDEO_EXTS
 
 
 def is_media(filename: str) -> bool:
@@ -45,7 +99,7 @@ def is_media(filename: str) -> bool:
     Returns:
         bool: True if the file is a supported media file, False otherwise
     """
-    return is_image(filename) or is_video(filename)
+    return _get_extension(filename) in _MEDIA_EXTS
 
 
 def get_media_type(filename: str) -> Literal['image', 'video', 'unknown']:
@@ -58,9 +112,10 @@ def get_media_type(filename: str) -> Literal['image', 'video', 'unknown']:
     Returns:
         str: 'image', 'video', or 'unknown'
     """
-    if is_image(filename):
+    ext = _get_extension(filename)
+    if ext in _IMAGE_EXTS:
         return 'image'
-    elif is_video(filename):
+    elif ext in _VIDEO_EXTS:
         return 'video'
     else:
         return 'unknown'
@@ -81,3 +136,290 @@ def get_thumbnail_url(filename: str, media_root: str) -> str:
         return f"/thumbnail/{os.path.relpath(filename, start=media_root)}"
     else:
         return f"/media/{os.path.relpath(filename, start=media_root)}"
+
+
+@lru_cache(maxsize=THUMBNAIL_NAME_CACHE_MAX_ENTRIES)
+def _get_thumbnail_filename(filename: str, legacy: bool = False,
+                            extension: str = THUMBNAIL_EXTENSION) -> str:
+    """
+    Get the thumbnail file name for a media file.
+
+    The full relative path is flattened into the name (path separators become
+    underscores) so files with the same name in different folders do not
+    collide. Very long names are replaced by their hash. Results are
+    memoized, since the same media paths are looked up on every page view.
+
+    Args:
+        filename: Media file path relative to the media root
+        legacy: Return the name used by the old flat layout, which hashed
+            long names with MD5 instead of BLAKE2b
+        extension: Thumbnail file extension (PNG for thumbnails written by
+            older versions)
+
+    Returns:
+        str: Thumbnail file name (without directory)
+    """
+    safe_filename = filename.translate(_SAFE_NAME_TABLE)
+
+    # Limit filename length to avoid filesystem issues
+    if len(safe_filename) > 200:
+        if legacy:
+            file_hash = hashlib.md5(safe_filename.encode()).hexdigest()
+        else:
+            # Only used to avoid collisions, so a fast 128-bit hash is plenty
+            file_hash = hashlib.blake2b(
+                safe_filename.encode('utf-8', 'surrogatepass'), digest_size=16
+            ).hexdigest()
+        # Keep the media extension in the name (it is the same before and
+        # after flattening); the thumbnail extension is still appended below
+        media_extension = os.path.splitext(filename)[1]
+        safe_filename = f"{file_hash}{media_extension}"
+
+    return f"{safe_filename}{extension}"
+
+
+@lru_cache(maxsize=THUMBNAIL_NAME_CACHE_MAX_ENTRIES)
+def _get_sharded_path(thumbnail_dir: str, thumbnail_name: str) -> str:
+    """
+    Get the sharded location of a thumbnail file name (memoized).
+
+    Args:
+        thumbnail_dir: Directory where thumbnails are stored
+        thumbnail_name: Thumbnail file name (see _get_thumbnail_filename)
+
+    Returns:
+        str: Full path to the thumbnail
+    """
+    digest = hashlib.blake2b(thumbnail_name.encode(), digest_size=8).hexdigest()
+    return os.path.join(thumbnail_dir, digest[:2], digest[2:4], thumbnail_name)
+
+
+def get_thumbnail_path(thumbnail_dir: str, filename: str) -> str:
+    """
+    Get the path where the thumbnail for a media file is stored.
+
+    Thumbnails are sharded into two levels of subdirectories named after a
+    hash of the thumbnail name (e.g. ``ab/cd/folder_video.mp4.jpg``), which
+    keeps each directory small even for very large libraries.
+
+    Args:
+        thumbnail_dir: Directory where thumbnails are stored
+        filename: Media file path relative to the media root
+
+    Returns:
+        str: Full path to the thumbnail (which may not exist yet)
+    """
+    return _get_sharded_path(thumbnail_dir, _get_thumbnail_filename(filename))
+
+
+def _remember_thumbnail(key: Tuple[str, str], thumbnail_path: str) -> str:
+    """
+    Remember where a thumbnail was found, dropping the oldest entry when full.
+
+    Args:
+        key: (thumbnail_dir, filename)
+        thumbnail_path: Path of the existing thumbnail
+
+    Returns:
+        str: thumbnail_path
+    """
+    with _found_thumbnails_lock:
+        if key not in _found_thumbnails and len(_found_thumbnails) >= THUMBNAIL_LOOKUP_CACHE_MAX_ENTRIES:
+            del _found_thumbnails[next(iter(_found_thumbnails))]
+        _found_thumbnails[key] = thumbnail_path
+    return thumbnail_path
+
+
+def forget_thumbnail(thumbnail_dir: str, filename: str) -> None:
+    """
+    Drop the remembered location of a thumbnail (e.g. after it was deleted).
+
+    Args:
+        thumbnail_dir: Directory where thumbnails are stored
+        filename: Media file path relative to the media root
+    """
+    thumbnail_path = _found_thumbnails.pop((thumbnail_dir, filename), None)
+    if thumbnail_path is not None:
+        remove_thumbnail_file(thumbnail_dir, thumbnail_path[len(os.path.join(thumbnail_dir, '')):])
+
+
+def clear_thumbnail_lookups() -> None:
+    """Forget all remembered thumbnail locations and thumbnail file listings."""
+    _found_thumbnails.clear()
+    with _thumbnail_files_lock:
+        _thumbnail_files.clear()
+        _thumbnail_file_sets.clear()
+
+
+def _walk_thumbnail_files(thumbnail_dir: str, skip_empty: bool = False) -> List[str]:
+    """
+    List all thumbnail files below the thumbnail directory.
+
+    scandir gives file types from the listing, so the sharded tree is walked
+    without a stat per entry unless empty files have to be skipped.
+
+    Args:
+        thumbnail_dir: Directory where thumbnails are stored
+        skip_empty: Leave out empty (e.g. half-written) files
+
+    Returns:
+        List[str]: Paths relative to thumbnail_dir, with forward slashes
+    """
+    files = []
+    prefix_len = len(os.path.join(thumbnail_dir, ''))
+    stack = [thumbnail_dir]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(_THUMBNAIL_FILE_EXTENSIONS):
+                        if skip_empty:
+                            try:
+                                if entry.stat().st_size == 0:
+                                    continue
+                            except OSError:
+                                continue
+                        files.append(entry.path[prefix_len:].replace('\\', '/'))
+        except OSError as e:
+            # Skip unreadable directories, like os.walk() did
+            logger.debug(f"Skipping thumbnail directory: {e}")
+    return files
+
+
+def add_thumbnail_file(thumbnail_path: str) -> None:
+    """
+    Add a newly written thumbnail to the thumbnail file index.
+
+    Does nothing for thumbnail directories that have not been listed yet;
+    their first listing walks the directory and finds the file anyway.
+
+    Args:
+        thumbnail_path: Full path of the thumbnail file
+    """
+    if not thumbnail_path.lower().endswith(_THUMBNAIL_FILE_EXTENSIONS):
+        return
+
+    with _thumbnail_files_lock:
+        for thumbnail_dir, files in _thumbnail_files.items():
+            prefix = os.path.join(thumbnail_dir, '')
+            if thumbnail_path.startswith(prefix):
+                relative_path = thumbnail_path[len(prefix):].replace('\\', '/')
+                known = _thumbnail_file_sets[thumbnail_dir]
+                if relative_path not in known:
+                    known.add(relative_path)
+                    files.append(relative_path)
+                return
+
+
+def remove_thumbnail_file(thumbnail_dir: str, relative_path: str) -> None:
+    """
+    Drop a thumbnail that no longer exists from the thumbnail file index.
+
+    Args:
+        thumbnail_dir: Directory where thumbnails are stored
+        relative_path: Thumbnail path relative to thumbnail_dir
+    """
+    relative_path = relative_path.replace('\\', '/')
+    with _thumbnail_files_lock:
+        known = _thumbnail_file_sets.get(thumbnail_dir)
+        if known is not None and relative_path in known:
+            known.discard(relative_path)
+            _thumbnail_files[thumbnail_dir].remove(relative_path)
+
+
+def sample_thumbnail_files(thumbnail_dir: str, count: int) -> Tuple[List[str], int]:
+    """
+    Pick random thumbnail files without walking the thumbnail directory.
+
+    The directory is walked once, on first use (or after
+    clear_thumbnail_lookups); after that new thumbnails are added as they
+    are written and missing ones are dropped when they are found gone, so a
+    sample costs O(count) instead of a walk of the whole tree.
+
+    Args:
+        thumbnail_dir: Directory where thumbnails are stored
+        count: Maximum number of thumbnails to pick
+
+    Returns:
+        Tuple of (relative paths with forward slashes, total thumbnail count)
+    """
+    with _thumbnail_files_lock:
+        files = _thumbnail_files.get(thumbnail_dir)
+
+    if files is None:
+        # Walk outside the lock; if two requests race, both walks are valid
+        listed = _walk_thumbnail_files(thumbnail_dir)
+        with _thumbnail_files_lock:
+            files = _thumbnail_files.get(thumbnail_dir)
+            if files is None:
+                files = _thumbnail_files[thumbnail_dir] = listed
+                _thumbnail_file_sets[thumbnail_dir] = set(listed)
+
+    with _thumbnail_files_lock:
+        return random.sample(files, min(count, len(files))), len(files)
+
+
+def find_thumbnail(thumbnail_dir: str, filename: str) -> Optional[str]:
+    """
+    Find an existing, non-empty thumbnail for a media file.
+
+    PNG thumbnails written by older versions are still used. Those left in
+    the old flat layout are moved into their sharded location the first time
+    they are looked up, so upgrading does not regenerate the whole library.
+
+    Found thumbnails are remembered, so asking again costs a dict lookup
+    instead of a stat. Callers that find the file gone should call
+    forget_thumbnail.
+
+    Args:
+        thumbnail_dir: Directory where thumbnails are stored
+        filename: Media file path relative to the media root
+
+    Returns:
+        Optional[str]: Path to the thumbnail, or None if it does not exist
+    """
+    key = (thumbnail_dir, filename)
+    known = _found_thumbnails.get(key)
+    if known is not None:
+        return known
+
+    thumbnail_path = get_thumbnail_path(thumbnail_dir, filename)
+    try:
+        if os.stat(thumbnail_path).st_size > 0:
+            return _remember_thumbnail(key, thumbnail_path)
+        return None
+    except OSError:
+        pass
+
+    # PNG thumbnail from an older version, already sharded
+    png_path = _get_sharded_path(
+        thumbnail_dir, _get_thumbnail_filename(filename, extension=LEGACY_THUMBNAIL_EXTENSION)
+    )
+    try:
+        if os.stat(png_path).st_size > 0:
+            return _remember_thumbnail(key, png_path)
+    except OSError:
+        pass
+
+    legacy_path = os.path.join(
+        thumbnail_dir,
+        _get_thumbnail_filename(filename, legacy=True, extension=LEGACY_THUMBNAIL_EXTENSION)
+    )
+    try:
+        if os.stat(legacy_path).st_size > 0:
+            os.makedirs(os.path.dirname(png_path), exist_ok=True)
+            os.replace(legacy_path, png_path)
+            remove_thumbnail_file(thumbnail_dir, os.path.basename(legacy_path))
+            add_thumbnail_file(png_path)
+            return _remember_thumbnail(key, png_path)
+    except FileNotFoundError:
+        # Another request may have just migrated it
+        if os.path.exists(png_path):
+            return _remember_thumbnail(key, png_path)
+    except OSError as e:
+        logger.warning(f"Could not move legacy thumbnail {legacy_path}: {e}")
+
+    return None
+
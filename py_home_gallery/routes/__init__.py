@@ -10,6 +10,10 @@ This package contains Flask route definitions for:
 
 from py_home_gallery.routes import gallery, media, infinite, metadata, browse
 
+# Blueprints in registration order. Media routes are always registered as
+# fallback for Nginx (on-demand thumbnail generation)
+BLUEPRINTS = (gallery.bp, browse.bp, infinite.bp, metadata.bp, media.bp)
+
 # Redefine the register_routes function to use our blueprint modules
 def register_routes(app):
     """
@@ -18,11 +22,8 @@ def register_routes(app):
     Media routes are always registered as fallback for Nginx (on-demand thumbnail generation).
     When SERVE_MEDIA is False, Nginx serves existing files first, Flask generates missing ones.
     """
-    app.register_blueprint(gallery.bp)
-    app.register_blueprint(browse.bp)
-    app.register_blueprint(infinite.bp)
-    app.register_blueprint(metadata.bp)
-    app.register_blueprint(media.bp)  # Always register for fallback
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
 
     # Just informational message
     if app.config.get('SERVE_MEDIA', True):
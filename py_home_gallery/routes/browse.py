@@ -7,9 +7,9 @@ which allows folder-based navigation.
 
 import os
 import random
+from typing import Any, Dict, List, Tuple
 from flask import Blueprint, render_template, jsonify, current_app
 from py_home_gallery.media.scanner import list_subfolders, scan_directory
-from py_home_gallery.media.utils import is_image
 from py_home_gallery.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,6 +17,42 @@ logger = get_logger(__name__)
 # Create a blueprint for browse routes
 bp = Blueprint('browse', __name__)
 
+# Thumbnail candidates per folder, stored with the scan result they came from;
+# reused for as long as the scanner keeps returning that same (cached) list
+_candidate_cache: Dict[str, Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+
+
+def _get_thumbnail_candidates(folder_path: str, media_files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Get the images of a folder that can be used as its browse thumbnail.
+
+    Vertical images (height > width) are preferred; without any, every image
+    qualifies. The filtered list is cached against the scan result object,
+    so a rescan (new list) recomputes it and cached scans skip the filtering.
+
+    Args:
+        folder_path: Full path of the folder
+        media_files: Scan result for the folder (with dimensions)
+
+    Returns:
+        List[Dict[str, Any]]: Candidate image items (empty if the folder has no images)
+    """
+    cached = _candidate_cache.get(folder_path)
+    if cached is not None and cached[0] is media_files:
+        return cached[1]
+
+    images = [item for item in media_files if item['media_type'] == 'image']
+    # Filter for vertical images only (height > width)
+    candidates = [item for item in images if item.get('height', 0) > item.get('width', 0)]
+
+    # If no vertical images, fall back to any image
+    if not candidates:
+        logger.debug(f"No vertical images in {folder_path}, using any image")
+        candidates = images
+
+    _candidate_cache[folder_path] = (media_files, candidates)
+    return candidates
+
 
 @bp.route('/browse')
 def browse():
@@ -54,19 +90,7 @@ def browse_api():
                 logger.debug(f"No media files in folder: {folder_name}")
                 continue
 
-            # Filter for vertical images only (height > width)
-            vertical_images = [
-                item for item in media_files
-                if is_image(item['path']) and item.get('height', 0) > item.get('width', 0)
-            ]
-
-            # If no vertical images, fall back to any image
-            if not vertical_images:
-                logger.debug(f"No vertical images in {folder_name}, using any image")
-                vertical_images = [
-                    item for item in media_files
-                    if is_image(item['path'])
-                ]
+            vertical_images = _get_thumbnail_candidates(folder_path, media_files)
 
             # If still no images, skip this folder
             if not vertical_images:
@@ -5,18 +5,46 @@ This module contains route handlers for the main gallery views,
 including default, random, and newest-first sorting.
 """
 
+import random
+from operator import countOf, itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from flask import Blueprint, render_template, request, current_app
-from py_home_gallery.media.scanner import list_subfolders, validate_and_get_folder_path, get_sorted_files
+from py_home_gallery.media.scanner import list_subfolders, validate_and_get_folder_path, get_sorted_files, iter_media_files, clear_scan_cache, scan_directory
 from py_home_gallery.media.dimension_helper import add_dimensions_to_items
 from py_home_gallery.utils.pagination import paginate_items
-from py_home_gallery.media.utils import is_image, is_video
 from py_home_gallery.utils.logger import get_logger
+from py_home_gallery.constants import RANDOM_GALLERY_MAX_ITEMS
 
 # Create a blueprint for gallery routes
 bp = Blueprint('gallery', __name__)
 logger = get_logger(__name__)
 
 
+def _split_by_type(media: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Split media items into images and videos in a single pass.
+
+    Uses the media type the scanner stored on each item.
+
+    Args:
+        media: Media info dictionaries
+
+    Returns:
+        Tuple of (images, videos), each in the original order
+    """
+    images = []
+    videos = []
+
+    for item in media:
+        kind = item['media_type']
+        if kind == 'image':
+            images.append(item)
+        elif kind == 'video':
+            videos.append(item)
+
+    return images, videos
+
+
 def handle_gallery(folder=None, sort_by="default", media_type=None):
     """
     Unified handler for gallery endpoints.
@@ -42,11 +70,16 @@ def handle_gallery(folder=None, sort_by="default", media_type=None):
         logger.error(f"Error getting files: {e}")
         return f"Error retrieving files: {str(e)}", 500
     
-    # Filter by media type if specified
+    # Split by type once; this gives both the filtered list and the counts
+    images, videos = _split_by_type(media)
+
+    # Filter by media type if specified (counts cover what is shown)
     if media_type == 'images':
-        media = [item for item in media if is_image(item['path'])]
+        media = images
+        videos = []
     elif media_type == 'videos':
-        media = [item for item in media if is_video(item['path'])]
+        media = videos
+        images = []
 
     # Paginate the files
     page = int(request.args.get('page', 1))
@@ -60,8 +93,8 @@ def handle_gallery(folder=None, sort_by="default", media_type=None):
     folders = list_subfolders(media_root)
 
     # Count different media types for the UI
-    image_count = len([item for item in media if is_image(item['path'])])
-    video_count = len([item for item in media if is_video(item['path'])])
+    image_count = len(images)
+    video_count = len(videos)
     total_count = len(media)
 
     logger.debug(f"Media stats - Total: {total_count}, Images: {image_count}, Videos: {video_count}")
@@ -100,6 +133,52 @@ def gallery():
     return handle_gallery(folder=folder, sort_by="default", media_type=media_type)
 
 
+def _sample_media(items: Iterable[Dict[str, Any]], count: int,
+                  media_type: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    Pick a uniform random sample of media items in a single pass.
+
+    Uses reservoir sampling, so only the sample is held in memory no matter
+    how many items the folder has.
+
+    Args:
+        items: Media info dictionaries
+        count: Maximum number of items to pick
+        media_type: 'images' or 'videos' to only pick that type, None for both
+
+    Returns:
+        Tuple of (sampled items in random order, image count, video count),
+        where the counts cover all matching items
+    """
+    sample = []
+    image_count = 0
+    video_count = 0
+
+    for item in items:
+        kind = item['media_type']
+        if kind == 'image':
+            if media_type == 'videos':
+                continue
+            image_count += 1
+        elif kind == 'video':
+            if media_type == 'images':
+                continue
+            video_count += 1
+        else:
+            continue
+
+        if len(sample) < count:
+            sample.append(item)
+        else:
+            # Replace a kept item with probability count / items seen so far
+            index = random.randrange(image_count + video_count)
+            if index < count:
+                sample[index] = item
+
+    random.shuffle(sample)
+    return sample, image_count, video_count
+
+
 @bp.route('/random')
 def random_gallery():
     """
@@ -120,35 +199,27 @@ def random_gallery():
     if not folder_path:
         return "Folder not found", 404
 
-    # Get random files (never cached - always shuffles)
+    # Get random files (never cached - always shuffles). The scan is streamed
+    # into a fixed-size random sample, so the folder's full media list is
+    # never built
     try:
-        media = get_sorted_files(media_root, folder_path, sort_by="random", include_dimensions=False, use_cache=False)
-        logger.info(f"Retrieved {len(media)} media files for random shuffle")
+        random_media, image_count, video_count = _sample_media(
+            iter_media_files(media_root, folder_path),
+            RANDOM_GALLERY_MAX_ITEMS,
+            media_type
+        )
+        total_count = image_count + video_count
+        logger.info(f"Picked {len(random_media)} of {total_count} media files for random shuffle")
     except Exception as e:
         logger.error(f"Error getting files: {e}")
         return f"Error retrieving files: {str(e)}", 500
 
-    # Filter by media type if specified
-    if media_type == 'images':
-        media = [item for item in media if is_image(item['path'])]
-    elif media_type == 'videos':
-        media = [item for item in media if is_video(item['path'])]
-
-    # Show first 100 random items (no pagination)
-    max_items = 100
-    random_media = media[:max_items]
-
     # Extract dimensions only for items we're showing
     add_dimensions_to_items(random_media, media_root, thumbnail_dir)
 
     # List all subfolders for dropdown
     folders = list_subfolders(media_root)
 
-    # Count different media types for the UI
-    image_count = len([item for item in media if is_image(item['path'])])
-    video_count = len([item for item in media if is_video(item['path'])])
-    total_count = len(media)
-
     # Render random template with shuffle button
     return render_template(
         'random.html',
@@ -185,13 +256,12 @@ def api_stats():
     media_root = current_app.config['MEDIA_ROOT']
 
     try:
-        # Get all media files (use cache for speed)
-        media = get_sorted_files(media_root, media_root, sort_by="default", include_dimensions=False)
-
-        # Count by type
-        image_count = len([item for item in media if is_image(item['path'])])
-        video_count = len([item for item in media if is_video(item['path'])])
+        # Count straight from the cached root scan (warmed at startup): no
+        # sorted copy or per-type lists, just a C-level count of one field
+        media = scan_directory(media_root, use_cache=True, include_dimensions=False)
         total_count = len(media)
+        video_count = countOf(map(itemgetter('media_type'), media), 'video')
+        image_count = total_count - video_count
 
         # Count folders
         folders = list_subfolders(media_root)
@@ -212,3 +282,21 @@ def api_stats():
             'folder_count': 0,
             'error': str(e)
         }), 500
+
+
+@bp.route('/api/cache/clear', methods=['POST'])
+def api_clear_cache():
+    """
+    API endpoint that drops all cached directory scans (and remembered
+    thumbnail locations).
+
+    Cached scans are already refreshed when a folder's contents change, and
+    nested folders are revalidated once the cache TTL expires, so this is only
+    needed to show deep changes right away or after files were edited in place.
+    """
+    from flask import jsonify
+
+    clear_scan_cache()
+    logger.info("Directory scan cache cleared via API")
+
+    return jsonify({'success': True})
@@ -4,10 +4,9 @@ Infinite scrolling route handlers for Py Home Gallery.
 This module contains route handlers for the infinite scrolling gallery view.
 """
 
-import os
 from typing import List, Tuple
 from flask import Blueprint, render_template, request, jsonify, current_app, Response
-from py_home_gallery.media.scanner import scan_directory
+from py_home_gallery.media.scanner import get_sorted_files
 from py_home_gallery.media.dimension_helper import add_dimensions_to_items
 from py_home_gallery.utils.logger import get_logger
 
@@ -16,10 +15,6 @@ logger = get_logger(__name__)
 # Create a blueprint for infinite scrolling routes
 bp = Blueprint('infinite', __name__)
 
-# Global variable to store media metadata
-from typing import Dict, Any
-media_files: List[Dict[str, Any]] = []
-
 
 @bp.route('/infinite')
 def infinite_gallery() -> str:
@@ -29,31 +24,16 @@ def infinite_gallery() -> str:
     Returns:
         str: Rendered HTML template
     """
-    global media_files
-    
     try:
         media_root = current_app.config['MEDIA_ROOT']
         items_per_page = current_app.config['ITEMS_PER_PAGE']
         placeholder_url = current_app.config['PLACEHOLDER_URL']
 
         logger.info("Loading infinite gallery view")
-        
-        if not media_files:
-            logger.info(f"Scanning media directory: {media_root}")
-            # Fast scan without dimensions to get file list quickly
-            media_files = scan_directory(media_root, use_cache=True, include_dimensions=False)
-            logger.info(f"Found {len(media_files)} media files")
-
-        # Sort by newest first using cached mtime (no filesystem calls!)
-        try:
-            sorted_files = sorted(
-                media_files,
-                key=lambda x: x.get('mtime', 0),
-                reverse=True
-            )
-        except Exception as e:
-            logger.error(f"Error sorting files by modification time: {e}")
-            sorted_files = media_files
+
+        # Newest first; the sorted list is cached and rebuilt only when the
+        # media root changes (fast scan without dimensions)
+        sorted_files = get_sorted_files(media_root, media_root, sort_by='new', include_dimensions=False)
 
         # Load the first page
         start = 0
@@ -87,8 +67,6 @@ def gallery_data() -> Response:
     Returns:
         Response: JSON response with media data and pagination info
     """
-    global media_files
-    
     try:
         media_root = current_app.config['MEDIA_ROOT']
         items_per_page = current_app.config['ITEMS_PER_PAGE']
@@ -98,25 +76,14 @@ def gallery_data() -> Response:
 
         logger.debug(f"Gallery data request: page={page}, sort_by={sort_by}")
 
-        if not media_files:
-            logger.info(f"Scanning media directory: {media_root}")
-            # Fast scan without dimensions to get file list quickly
-            media_files = scan_directory(media_root, use_cache=True, include_dimensions=False)
-            logger.info(f"Found {len(media_files)} media files")
-
-        # Create a copy for sorting to avoid modifying the global list
-        sorted_files = media_files.copy()
-
-        if sort_by == 'new':
-            # Sort by last modification time with error handling
-            try:
-                sorted_files = sorted(
-                    sorted_files,
-                    key=lambda x: os.path.getmtime(os.path.join(media_root, x['path'])),
-                    reverse=True
-                )
-            except Exception as e:
-                logger.error(f"Error sorting files by modification time: {e}")
+        # Sort once per version of the media root instead of on every page;
+        # only 'new' is supported here, anything else keeps scan order
+        sorted_files = get_sorted_files(
+            media_root,
+            media_root,
+            sort_by='new' if sort_by == 'new' else 'default',
+            include_dimensions=False
+        )
 
         start = (page - 1) * items_per_page
         end = start + items_per_page
@@ -6,26 +6,99 @@ including original media and thumbnails.
 """
 
 import os
-from flask import Blueprint, send_file, current_app, abort
+import mimetypes
+from urllib.parse import quote
+from flask import Blueprint, Response, send_file, current_app, abort, redirect, request
+from werkzeug.exceptions import HTTPException
 from py_home_gallery.media.thumbnails import ensure_thumbnail_exists
+from py_home_gallery.media.utils import find_thumbnail, forget_thumbnail, get_thumbnail_path, remove_thumbnail_file
+from py_home_gallery.media.scanner import get_basename_index
+from py_home_gallery.workers.thumbnail_worker import get_thumbnail_worker
 from py_home_gallery.utils.security import get_safe_path, validate_media_extension
 from py_home_gallery.utils.logger import get_logger
-from py_home_gallery.workers.thumbnail_worker import get_thumbnail_worker
+from py_home_gallery.constants import MEDIA_CACHE_MAX_AGE, WORKER_PRIORITY_ON_DEMAND
 
 logger = get_logger(__name__)
 
 # Create a blueprint for media routes
 bp = Blueprint('media', __name__)
 
-# Get the global thumbnail worker
-thumbnail_worker = get_thumbnail_worker(num_threads=2)
+# Internal Nginx locations that map onto the media and thumbnail directories
+NGINX_MEDIA_LOCATION = '/_media/'
+NGINX_THUMBNAIL_LOCATION = '/_thumbnails/'
+
+
+def _send_cacheable_file(file_path: str) -> Response:
+    """
+    Send a file with long-lived browser caching.
+
+    send_file already adds ETag/Last-Modified, answers conditional
+    requests with 304 and serves Range requests as 206 Partial Content,
+    streaming only the requested bytes from disk so video seeking doesn't
+    re-download the file. On top of that, media and thumbnails are marked
+    cacheable for a year so repeat visits don't hit the server at all.
+
+    Args:
+        file_path: Absolute path of the file to send
+
+    Returns:
+        Response: File response
+    """
+    response = send_file(file_path, max_age=MEDIA_CACHE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def _send_file(file_path: str, root: str, nginx_location: str, verify: bool = False) -> Response:
+    """
+    Send a file, or let Nginx send it.
+
+    With USE_X_ACCEL enabled (--x-accel) the response carries only an
+    X-Accel-Redirect header pointing at an internal Nginx location, so the
+    file body is sent by Nginx (sendfile) instead of being streamed through
+    Python. This needs the internal locations of the bundled nginx.conf;
+    without the flag the file is always streamed (or sent via X-Sendfile).
+
+    Args:
+        file_path: Absolute path of the file to send
+        root: Directory the Nginx location is aliased to
+        nginx_location: Internal Nginx location prefix for root
+        verify: Stat the file before handing it to Nginx, for paths taken
+            from an in-memory index rather than checked by the caller
+
+    Returns:
+        Response: File response or X-Accel-Redirect response
+
+    Raises:
+        FileNotFoundError: If the file does not exist (when Flask sends it,
+            or with verify when Nginx does)
+    """
+    if not current_app.config.get('USE_X_ACCEL') or current_app.config.get('USE_X_SENDFILE'):
+        return _send_cacheable_file(file_path)
+
+    if verify:
+        # Nothing here opens the file, so check it still exists; otherwise
+        # Nginx would answer 404 until the remembered location is forgotten
+        os.stat(file_path)
+
+    rel_path = os.path.relpath(file_path, root).replace(os.sep, '/')
+    response = Response(mimetype=mimetypes.guess_type(file_path)[0] or 'application/octet-stream')
+    response.headers['X-Accel-Redirect'] = f"{nginx_location}{quote(rel_path)}"
+    return response
 
 
 @bp.route('/thumbnail/<path:filename>')
 def serve_thumbnail(filename):
     """
     Serve generated thumbnails for videos, creating them on-demand or in background.
-    
+
+    A missing thumbnail is queued on the background worker and the request
+    is redirected (302, not cached) to the placeholder, so a slow video
+    decode never ties up the request thread; the next page view gets the
+    real thumbnail. With workers disabled, or with ``?wait=1``, the
+    thumbnail is generated before responding instead.
+
     Security: Validates path to prevent traversal attacks.
     Performance: Uses background worker for thumbnail generation.
     """
@@ -45,29 +118,37 @@ def serve_thumbnail(filename):
             logger.warning(f"Path traversal attempt in thumbnail request: {filename}")
             abort(403, description="Access denied")
         
-        # Check if thumbnail already exists
-        safe_filename = filename.replace('\\', '_').replace('/', '_')
-        if len(safe_filename) > 200:
-            import hashlib
-            file_hash = hashlib.md5(safe_filename.encode()).hexdigest()
-            extension = os.path.splitext(safe_filename)[1]
-            safe_filename = f"{file_hash}{extension}"
-        
-        thumbnail_path = os.path.join(thumbnail_dir, f"{safe_filename}.png")
-        
         # If thumbnail exists and is valid, serve it immediately
-        if os.path.exists(thumbnail_path) and os.path.getsize(thumbnail_path) > 0:
+        thumbnail_path = find_thumbnail(thumbnail_dir, filename)
+        if thumbnail_path:
             logger.debug(f"Serving existing thumbnail: {filename}")
-            return send_file(thumbnail_path)
-
-        # Thumbnail doesn't exist - generate it synchronously (blocking request)
-        logger.info(f"Thumbnail not found, generating synchronously: {filename}")
+            try:
+                return _send_file(thumbnail_path, thumbnail_dir, NGINX_THUMBNAIL_LOCATION, verify=True)
+            except FileNotFoundError:
+                # Deleted since it was found; generate it again below
+                logger.warning(f"Thumbnail disappeared, regenerating: {thumbnail_path}")
+                forget_thumbnail(thumbnail_dir, filename)
 
         # Ensure media file exists
         if not media_file_path or not os.path.exists(media_file_path):
             logger.warning(f"Media file not found for thumbnail: {filename}")
             abort(404, description="Media file not found")
 
+        # Thumbnail doesn't exist - generate it in the background and show
+        # the placeholder for now (the worker skips already-queued files and
+        # runs these ahead of preload jobs, since a page is showing them)
+        if (current_app.config.get('WORKER_ENABLED', True) and placeholder_url
+                and request.args.get('wait') != '1'):
+            worker = get_thumbnail_worker(num_threads=current_app.config.get('WORKER_THREADS', 2))
+            thumbnail_path = get_thumbnail_path(thumbnail_dir, filename)
+            if worker.add_job(media_file_path, thumbnail_path, timeout=0,
+                              priority=WORKER_PRIORITY_ON_DEMAND):
+                logger.info(f"Thumbnail not found, queued for generation: {filename}")
+                return redirect(placeholder_url, 302)
+
+        # Generate the thumbnail synchronously (blocking request)
+        logger.info(f"Thumbnail not found, generating synchronously: {filename}")
+
         # Generate thumbnail synchronously - this will block until done
         thumbnail_result = ensure_thumbnail_exists(
             media_root,
@@ -78,14 +159,21 @@ def serve_thumbnail(filename):
 
         # Check if generation was successful
         if thumbnail_result and thumbnail_result != placeholder_url:
-            if os.path.exists(thumbnail_result) and os.path.getsize(thumbnail_result) > 0:
+            try:
+                generated = os.stat(thumbnail_result).st_size > 0
+            except OSError:
+                generated = False
+            if generated:
                 logger.info(f"Successfully generated thumbnail: {filename}")
-                return send_file(thumbnail_result)
+                return _send_file(thumbnail_result, thumbnail_dir, NGINX_THUMBNAIL_LOCATION)
 
         # Generation failed - return 404
         logger.error(f"Failed to generate thumbnail for: {filename}")
         abort(404, description="Thumbnail generation failed")
     
+    except HTTPException:
+        # Keep intended statuses such as 400, 403 or 404
+        raise
     except Exception as e:
         logger.error(f"Error serving thumbnail for {filename}: {e}")
         return placeholder_url or abort(500, description="Internal server error")
@@ -109,14 +197,17 @@ def serve_mosaic_thumbnail(filename):
             logger.warning(f"Path traversal attempt in mosaic thumbnail request: {filename}")
             abort(403, description="Access denied")
 
-        # Check if the file exists
-        if not os.path.exists(thumbnail_path):
+        # Serve the thumbnail directly (or hand it to Nginx, like /thumbnail)
+        try:
+            return _send_file(thumbnail_path, thumbnail_dir, NGINX_THUMBNAIL_LOCATION, verify=True)
+        except FileNotFoundError:
+            # Deleted since it was listed; keep it out of later mosaics
             logger.warning(f"Thumbnail not found: {thumbnail_path}")
+            remove_thumbnail_file(thumbnail_dir, filename)
             abort(404, description="Thumbnail not found")
 
-        # Serve the thumbnail directly
-        return send_file(thumbnail_path)
-
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error serving mosaic thumbnail {filename}: {e}")
         abort(500, description="Internal server error")
@@ -155,17 +246,15 @@ def serve_media(filename):
             logger.debug(f"Searching for file by basename: {basename}")
             
             try:
-                for root, _, files in os.walk(media_root):
-                    if basename in files:
-                        candidate_path = os.path.join(root, basename)
-                        
-                        # Validate the found path is also safe
-                        rel_path = os.path.relpath(candidate_path, media_root)
-                        safe_candidate = get_safe_path(media_root, rel_path)
-                        
-                        if safe_candidate and os.path.exists(safe_candidate):
-                            logger.info(f"Found file at alternative location: {safe_candidate}")
-                            return send_file(safe_candidate)
+                # Look the name up in the index built from the cached scan
+                # instead of walking the whole media tree
+                for rel_path in get_basename_index(media_root).get(basename, ()):
+                    # Validate the found path is also safe
+                    safe_candidate = get_safe_path(media_root, rel_path)
+
+                    if safe_candidate and os.path.exists(safe_candidate):
+                        logger.info(f"Found file at alternative location: {safe_candidate}")
+                        return _send_file(safe_candidate, media_root, NGINX_MEDIA_LOCATION)
             except Exception as e:
                 logger.error(f"Error during file search: {e}")
             
@@ -178,8 +267,11 @@ def serve_media(filename):
             abort(403, description="Permission denied")
         
         logger.info(f"Serving media file: {filename}")
-        return send_file(file_path)
+        return _send_file(file_path, media_root, NGINX_MEDIA_LOCATION)
     
+    except HTTPException:
+        # Keep intended statuses such as 404 or 416 (unsatisfiable Range)
+        raise
     except Exception as e:
         logger.error(f"Error serving media file {filename}: {e}")
         abort(500, description="Internal server error")
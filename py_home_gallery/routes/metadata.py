@@ -4,18 +4,31 @@ Metadata API routes for Py Home Gallery.
 This module provides API endpoints for retrieving media metadata.
 """
 
-from flask import Blueprint, jsonify, current_app, make_response, request
+from flask import Blueprint, jsonify, current_app, request
 from py_home_gallery.utils.metadata import get_media_metadata, format_metadata_for_display
 from py_home_gallery.utils.security import get_safe_path
+from py_home_gallery.media.utils import sample_thumbnail_files
 from py_home_gallery.utils.logger import get_logger
 import os
-import json
-import random
 
 bp = Blueprint('metadata', __name__)
 logger = get_logger(__name__)
 
 
+def _stringify_json_value(value):
+    """
+    Encode a metadata value that JSON can't represent as its string form.
+
+    Args:
+        value: Value the JSON encoder rejected
+
+    Returns:
+        str: str(value)
+    """
+    logger.debug(f"Writing non-JSON metadata value as string: {type(value).__name__}")
+    return str(value)
+
+
 @bp.route('/api/metadata/<path:media_path>')
 def get_metadata(media_path):
     """
@@ -45,48 +58,17 @@ def get_metadata(media_path):
         # Format for display
         formatted = format_metadata_for_display(metadata)
 
-        # Test JSON serialization of formatted data
-        try:
-            json.dumps(formatted)
-        except (TypeError, ValueError) as e:
-            print(f"Error: Formatted metadata not JSON serializable for {media_path}: {e}")
-            print(f"Formatted data: {formatted}")
-            # Try to clean the formatted data
-            import copy
-            cleaned = {}
-            for section, data in formatted.items():
-                cleaned[section] = {}
-                if isinstance(data, dict):
-                    for k, v in data.items():
-                        try:
-                            json.dumps({k: v})
-                            cleaned[section][k] = v
-                        except:
-                            print(f"  Skipping {section}.{k} = {v} (type: {type(v)})")
-                            cleaned[section][k] = str(v)
-            formatted = cleaned
-
-        # Test JSON serialization of raw metadata
-        try:
-            json.dumps(metadata)
-            include_raw = True
-        except (TypeError, ValueError) as e:
-            print(f"Warning: Raw metadata not JSON serializable for {media_path}: {e}")
-            include_raw = False
-
         response_data = {
             'success': True,
             'path': media_path,
-            'metadata': formatted
+            'metadata': formatted,
+            'raw': metadata
         }
 
-        if include_raw:
-            response_data['raw'] = metadata
-
-        # Create response with sort_keys=False to avoid int/str comparison errors
-        response = make_response(json.dumps(response_data, sort_keys=False))
-        response.headers['Content-Type'] = 'application/json'
-        return response
+        # Encode once with the app's JSON provider (orjson when installed);
+        # any value the encoder can't handle is written as a string
+        data = current_app.json.dumps(response_data, default=_stringify_json_value)
+        return current_app.response_class(data, mimetype=current_app.json.mimetype)
 
     except Exception as e:
         import traceback
@@ -124,32 +106,21 @@ def mosaic():
         requested_count = 100
 
     try:
-        # Get all thumbnail files
-        thumbnails = []
-        for root, dirs, files in os.walk(thumbnail_dir):
-            for file in files:
-                # Only include image files
-                if file.lower().endswith(('.jpg', '.jpeg', '.png', '.webp')):
-                    # Get relative path from thumbnail dir
-                    full_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(full_path, thumbnail_dir)
-                    # Convert to URL-safe path (forward slashes, not backslashes)
-                    url_path = rel_path.replace('\\', '/')
-                    # Return as mosaic thumbnail URL (direct serving, no generation)
-                    thumbnails.append(f'/mosaic-thumb/{url_path}')
-
-        logger.info(f"Found {len(thumbnails)} total thumbnails, requested {requested_count}")
-
         # Pick random thumbnails (requested count or all if less available)
-        count = min(requested_count, len(thumbnails))
-        random_thumbnails = random.sample(thumbnails, count) if thumbnails else []
+        # from the in-memory thumbnail index, not a walk of the whole tree
+        picked, total = sample_thumbnail_files(thumbnail_dir, requested_count)
+        logger.info(f"Found {total} total thumbnails, requested {requested_count}")
+
+        # Return as mosaic thumbnail URLs (direct serving, no generation)
+        random_thumbnails = [f'/mosaic-thumb/{path}' for path in picked]
+        count = len(random_thumbnails)
 
         return jsonify({
             'success': True,
             'thumbnails': random_thumbnails,
             'count': count,
             'requested': requested_count,
-            'total': len(thumbnails)
+            'total': total
         })
 
     except Exception as e:
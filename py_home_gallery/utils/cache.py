@@ -8,18 +8,35 @@ by reducing repeated filesystem operations.
 import time
 import hashlib
 import threading
-from typing import Optional, Any, Dict, Callable
+from typing import Optional, Any, Dict, Callable, Tuple
 from functools import wraps
 from py_home_gallery.utils.logger import get_logger
 from py_home_gallery.constants import (
     DEFAULT_CACHE_TTL,
     CACHE_PREFIX_DIRECTORY,
     CACHE_PREFIX_FILE,
+    DIMENSION_CACHE_MAX_ENTRIES,
 )
 
 logger = get_logger(__name__)
 
 
+def _digest(text: str) -> str:
+    """
+    Hash a string into a short, fixed-length cache key component.
+
+    Keys only live in memory, so a fast 128-bit BLAKE2b digest is used.
+    Paths with undecodable bytes (surrogate escapes) are hashed as-is.
+
+    Args:
+        text: Text to hash
+
+    Returns:
+        str: 32-character hex digest
+    """
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
 class SimpleCache:
     """
     Simple in-memory cache with TTL (Time To Live) support.
@@ -147,6 +164,11 @@ class SimpleCache:
 _directory_cache: Optional[SimpleCache] = None
 _metadata_cache: Optional[SimpleCache] = None
 
+# Media dimensions keyed by (path, st_mtime_ns, st_size). A changed file gets
+# a new key, so entries never need a TTL; insertion order gives FIFO eviction
+_dimension_cache: Dict[Tuple[str, int, int], Tuple[int, int]] = {}
+_dimension_cache_lock = threading.Lock()
+
 
 def setup_caches(directory_ttl: int = DEFAULT_CACHE_TTL, metadata_ttl: int = DEFAULT_CACHE_TTL * 2) -> None:
     """
@@ -200,6 +222,33 @@ def get_metadata_cache() -> SimpleCache:
     return _metadata_cache
 
 
+def get_cached_dimensions(key: Tuple[str, int, int]) -> Optional[Tuple[int, int]]:
+    """
+    Get memoized media dimensions.
+
+    Args:
+        key: (file path, st_mtime_ns, st_size) of the media file
+
+    Returns:
+        Optional[Tuple[int, int]]: (width, height) if cached, None otherwise
+    """
+    return _dimension_cache.get(key)
+
+
+def set_cached_dimensions(key: Tuple[str, int, int], dims: Tuple[int, int]) -> None:
+    """
+    Memoize media dimensions, evicting the oldest entry when the cache is full.
+
+    Args:
+        key: (file path, st_mtime_ns, st_size) of the media file
+        dims: (width, height) of the media file
+    """
+    with _dimension_cache_lock:
+        if key not in _dimension_cache and len(_dimension_cache) >= DIMENSION_CACHE_MAX_ENTRIES:
+            del _dimension_cache[next(iter(_dimension_cache))]
+        _dimension_cache[key] = dims
+
+
 def cached(ttl: int = 300, cache_instance: Optional[SimpleCache] = None):
     """
     Decorator to cache function results.
@@ -222,7 +271,7 @@ def cached(ttl: int = 300, cache_instance: Optional[SimpleCache] = None):
         def wrapper(*args, **kwargs):
             # Create cache key from function name and arguments
             key_data = f"{func.__module__}.{func.__name__}:{args}:{sorted(kwargs.items())}"
-            cache_key = hashlib.md5(key_data.encode()).hexdigest()
+            cache_key = _digest(key_data)
             
             # Try to get from cache
             result = cache_instance.get(cache_key)
@@ -256,7 +305,7 @@ def cache_key_for_directory(directory: str) -> str:
     Returns:
         str: Cache key
     """
-    return f"{CACHE_PREFIX_DIRECTORY}{hashlib.md5(directory.encode()).hexdigest()}"
+    return f"{CACHE_PREFIX_DIRECTORY}{_digest(directory)}"
 
 
 def cache_key_for_file(filepath: str) -> str:
@@ -269,7 +318,7 @@ def cache_key_for_file(filepath: str) -> str:
     Returns:
         str: Cache key
     """
-    return f"{CACHE_PREFIX_FILE}{hashlib.md5(filepath.encode()).hexdigest()}"
+    return f"{CACHE_PREFIX_FILE}{_digest(filepath)}"
 
 
 def invalidate_directory_cache(directory: str) -> None:
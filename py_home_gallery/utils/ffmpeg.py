@@ -1,11 +1,31 @@
 """
-FFmpeg validation utility for Py Home Gallery.
+FFmpeg utilities for Py Home Gallery.
 
 This module contains functions for checking if FFmpeg is installed
-and accessible in the system PATH.
+and accessible in the system PATH, and thin wrappers around the
+ffmpeg/ffprobe command-line tools used for video thumbnails.
 """
 
+import os
+import json
 import subprocess
+import threading
+from typing import Dict, Optional, Tuple, List
+from py_home_gallery.utils.logger import get_logger
+from py_home_gallery.utils.probe_cache import get_probe_cache
+from py_home_gallery.constants import (
+    FFMPEG_TIMEOUT, FFPROBE_TIMEOUT, THUMBNAIL_FFMPEG_QSCALE, PROBE_MEMO_MAX_ENTRIES
+)
+
+logger = get_logger(__name__)
+# Hardware decoder passed to ffmpeg -hwaccel (configured via configure_ffmpeg)
+_hwaccel: Optional[str] = None
+# Successful probe results keyed by (path, st_mtime_ns, st_size). Failures are
+# not memoized, so a video that could not be probed (e.g. still being copied,
+# or ffprobe timed out under load) is tried again; insertion order gives FIFO
+# eviction
+_probe_results: Dict[Tuple[str, int, int], Tuple[Optional[float], Optional[int], Optional[int]]] = {}
+_probe_results_lock = threading.Lock()
 
 
 def check_ffmpeg():
@@ -29,3 +49,251 @@ def check_ffmpeg():
     except Exception:
         # If any exception occurs (like FileNotFoundError), FFmpeg is not installed
         return False
+
+
+def get_hwaccels() -> List[str]:
+    """
+    Get the hardware acceleration methods supported by the installed ffmpeg.
+
+    Returns:
+        List[str]: Method names (e.g. 'cuda', 'vaapi'), empty if unavailable
+    """
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-hwaccels'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=FFPROBE_TIMEOUT,
+            check=False
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return []
+
+    # Output is a header line followed by one method per line
+    lines = result.stdout.decode('utf-8', errors='replace').splitlines()
+    return [line.strip() for line in lines[1:] if line.strip()]
+
+
+def configure_ffmpeg(hwaccel: Optional[str] = None) -> None:
+    """
+    Configure ffmpeg settings used for thumbnail frame grabs.
+
+    Should be called once during application startup with config values.
+    Unsupported methods are logged and ignored so thumbnails keep working.
+
+    Args:
+        hwaccel: Hardware decoder to use ('auto' or a method listed by
+            ffmpeg -hwaccels), or None/empty to decode on the CPU
+    """
+    global _hwaccel
+
+    if not hwaccel:
+        _hwaccel = None
+        return
+
+    if hwaccel != 'auto' and hwaccel not in get_hwaccels():
+        logger.warning(f"FFmpeg does not support hwaccel '{hwaccel}', decoding thumbnails on CPU")
+        _hwaccel = None
+        return
+
+    _hwaccel = hwaccel
+    logger.info(f"FFmpeg hardware decoding enabled: {hwaccel}")
+
+
+def _probe_video(video_path: str, mtime_ns: int, size: int) -> Tuple[Optional[float], Optional[int], Optional[int]]:
+    """
+    Probe a given file version and return its duration and frame size.
+
+    The mtime/size arguments are part of the memo key, so a file that
+    changes on disk is probed again. Only successful probes are memoized.
+    """
+    key = (video_path, mtime_ns, size)
+    result = _probe_results.get(key)
+    if result is not None:
+        return result
+
+    result = _run_probe(video_path, mtime_ns, size)
+    if result is None:
+        return None, None, None
+
+    with _probe_results_lock:
+        if key not in _probe_results and len(_probe_results) >= PROBE_MEMO_MAX_ENTRIES:
+            del _probe_results[next(iter(_probe_results))]
+        _probe_results[key] = result
+    return result
+
+
+def _run_probe(video_path: str, mtime_ns: int, size: int
+               ) -> Optional[Tuple[Optional[float], Optional[int], Optional[int]]]:
+    """
+    Run ffprobe on a video, going through the persistent probe cache.
+
+    Results are kept in the persistent probe cache (when configured) so they
+    survive restarts.
+
+    Returns:
+        Optional[Tuple]: (duration, width, height), or None if ffprobe failed
+    """
+    probe_cache = get_probe_cache()
+    if probe_cache is not None:
+        cached = probe_cache.get(video_path, mtime_ns, size)
+        if cached is not None:
+            return cached['duration'], cached['width'], cached['height']
+
+    try:
+        result = subprocess.run(
+            [
+                'ffprobe', '-v', 'error',
+                '-select_streams', 'v:0',
+                '-show_entries', 'format=duration:stream=width,height',
+                '-of', 'json',
+                video_path
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=FFPROBE_TIMEOUT,
+            check=False
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.debug(f"ffprobe failed for {video_path}: {e}")
+        return None
+
+    if result.returncode != 0:
+        logger.debug(f"ffprobe exited with {result.returncode} for {video_path}")
+        return None
+
+    try:
+        info = json.loads(result.stdout)
+    except ValueError:
+        return None
+
+    duration = None
+    try:
+        duration = float(info.get('format', {}).get('duration'))
+    except (TypeError, ValueError):
+        # Some containers report "N/A" or no duration at all
+        pass
+
+    streams = info.get('streams') or [{}]
+    width = streams[0].get('width')
+    height = streams[0].get('height')
+
+    if probe_cache is not None:
+        probe_cache.set(video_path, mtime_ns, size, duration, width, height)
+
+    return duration, width, height
+
+
+def _probe_file(video_path: str) -> Tuple[Optional[float], Optional[int], Optional[int]]:
+    """Stat a video and return its (cached) probe result."""
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        return None, None, None
+
+    return _probe_video(video_path, st.st_mtime_ns, st.st_size)
+
+
+def get_video_duration(video_path: str) -> Optional[float]:
+    """
+    Get the duration of a video in seconds using ffprobe.
+
+    Only the container header is read, no frames are decoded. Results are
+    cached per path and invalidated when the file's mtime or size changes.
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        Optional[float]: Duration in seconds, or None if it could not be determined
+    """
+    return _probe_file(video_path)[0]
+
+
+def get_video_resolution(video_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Get the frame size of a video's first video stream using ffprobe.
+
+    Shares the probe (and its caches) with get_video_duration().
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        Optional[Tuple[int, int]]: (width, height), or None if it could not be determined
+    """
+    _, width, height = _probe_file(video_path)
+    if width and height:
+        return (width, height)
+    return None
+
+
+def extract_frame(video_path: str, output_path: str, timestamp: float,
+                  width: int, height: int) -> bool:
+    """
+    Grab a single frame from a video and write it as a scaled image.
+
+    Places ``-ss`` before ``-i`` so ffmpeg seeks on the demuxer to the nearest
+    keyframe instead of decoding every frame up to the timestamp. The frame is
+    scaled to fit within width x height (aspect ratio preserved) and encoded
+    by ffmpeg directly, using the format implied by the output extension.
+
+    When hardware decoding is configured the frame is decoded on the GPU
+    first, and the grab is retried on the CPU if that fails.
+
+    Args:
+        video_path: Path to the video file
+        output_path: Path where the image should be written
+        timestamp: Position in seconds to grab the frame from
+        width: Maximum output width
+        height: Maximum output height
+
+    Returns:
+        bool: True if the image was written successfully, False otherwise
+    """
+    if _hwaccel:
+        if _run_frame_grab(video_path, output_path, timestamp, width, height, _hwaccel):
+            return True
+        logger.info(f"Hardware decoding failed, retrying on CPU: {video_path}")
+
+    return _run_frame_grab(video_path, output_path, timestamp, width, height)
+
+
+def _run_frame_grab(video_path: str, output_path: str, timestamp: float,
+                    width: int, height: int, hwaccel: Optional[str] = None) -> bool:
+    """Run a single ffmpeg frame grab, optionally with a hardware decoder."""
+    command = ['ffmpeg', '-v', 'error', '-nostdin']
+    if hwaccel:
+        command += ['-hwaccel', hwaccel]
+    command += [
+        '-ss', f"{max(timestamp, 0):.3f}",
+        '-i', video_path,
+        '-frames:v', '1',
+        '-an',
+        '-vf', f"scale=w={width}:h={height}:force_original_aspect_ratio=decrease",
+        '-q:v', str(THUMBNAIL_FFMPEG_QSCALE),
+        '-update', '1',
+        '-y', output_path
+    ]
+
+    try:
+        result = subprocess.run(
+            command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=FFMPEG_TIMEOUT,
+            check=False
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"ffmpeg frame grab failed for {video_path}: {e}")
+        return False
+
+    if result.returncode != 0:
+        stderr = result.stderr.decode('utf-8', errors='replace').strip()
+        logger.warning(f"ffmpeg exited with {result.returncode} for {video_path}: {stderr}")
+        return False
+
+    try:
+        return os.path.getsize(output_path) > 0
+    except OSError:
+        return False
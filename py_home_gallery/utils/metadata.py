@@ -11,6 +11,10 @@ from PIL.ExifTags import TAGS, GPSTAGS
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+# Extensions that get EXIF or video stream metadata
+_IMAGE_EXTS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'})
+_VIDEO_EXTS = frozenset({'.mp4', '.mov', '.avi', '.mkv', '.webm'})
+
 
 def get_file_info(file_path: str) -> Dict[str, Any]:
     """
@@ -220,10 +224,10 @@ def get_media_metadata(file_path: str) -> Dict[str, Any]:
     # Determine file type and get appropriate metadata
     ext = os.path.splitext(file_path)[1].lower()
 
-    if ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp']:
+    if ext in _IMAGE_EXTS:
         metadata['type'] = 'image'
         metadata['exif'] = get_image_exif(file_path)
-    elif ext in ['.mp4', '.mov', '.avi', '.mkv', '.webm']:
+    elif ext in _VIDEO_EXTS:
         metadata['type'] = 'video'
         metadata['video'] = get_video_info(file_path)
     else:
@@ -0,0 +1,151 @@
+"""
+Persistent video probe cache for Py Home Gallery.
+
+This module stores ffprobe results (duration and frame size) in a small
+SQLite database so videos are not probed again after a restart unless
+they have changed on disk.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Optional, Dict, Any
+from py_home_gallery.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ProbeCache:
+    """
+    SQLite-backed cache of video probe results.
+
+    Entries are keyed by path and validated against the file's mtime and size,
+    so a modified video is treated as a miss and probed again.
+
+    Example:
+        >>> cache = ProbeCache('/path/to/probe_cache.sqlite3')
+        >>> cache.set('/videos/a.mp4', mtime_ns, size, 12.5, 1920, 1080)
+        >>> cache.get('/videos/a.mp4', mtime_ns, size)
+        {'duration': 12.5, 'width': 1920, 'height': 1080}
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (and create if needed) the probe cache database.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS probes ('
+                'path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, '
+                'duration REAL, width INTEGER, height INTEGER)'
+            )
+            self._conn.commit()
+        logger.info(f"Probe cache opened: {db_path}")
+
+    def get(self, path: str, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored probe result for a file version.
+
+        Args:
+            path: Path to the video file
+            mtime_ns: File modification time in nanoseconds
+            size: File size in bytes
+
+        Returns:
+            Optional[Dict[str, Any]]: Dict with duration, width and height,
+                or None if the file has not been probed in this version
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT duration, width, height FROM probes WHERE path=? AND mtime_ns=? AND size=?',
+                    (path, mtime_ns, size)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Probe cache read failed for {path}: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        return {'duration': row[0], 'width': row[1], 'height': row[2]}
+
+    def set(self, path: str, mtime_ns: int, size: int, duration: Optional[float],
+            width: Optional[int], height: Optional[int]) -> None:
+        """
+        Store the probe result for a file version, replacing older entries.
+
+        Args:
+            path: Path to the video file
+            mtime_ns: File modification time in nanoseconds
+            size: File size in bytes
+            duration: Duration in seconds (None if unknown)
+            width: Frame width in pixels (None if unknown)
+            height: Frame height in pixels (None if unknown)
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO probes (path, mtime_ns, size, duration, width, height) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (path, mtime_ns, size, duration, width, height)
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Probe cache write failed for {path}: {e}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# Global probe cache instance (None until configured)
+_probe_cache: Optional[ProbeCache] = None
+
+
+def setup_probe_cache(db_path: str) -> None:
+    """
+    Initialize the global probe cache.
+
+    Should be called once during application startup. If the database cannot
+    be opened, probing keeps working without persistence.
+
+    Args:
+        db_path: Path to the SQLite database file
+    """
+    global _probe_cache
+
+    try:
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        _probe_cache = ProbeCache(db_path)
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Could not open probe cache {db_path}: {e}")
+        _probe_cache = None
+
+
+def get_probe_cache() -> Optional[ProbeCache]:
+    """
+    Get the global probe cache instance.
+
+    Returns:
+        Optional[ProbeCache]: Probe cache, or None if it is not configured
+    """
+    return _probe_cache
+
+
+def shutdown_probe_cache() -> None:
+    """Close the global probe cache."""
+    global _probe_cache
+
+    if _probe_cache is not None:
+        _probe_cache.close()
+        _probe_cache = None
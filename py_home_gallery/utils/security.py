@@ -8,6 +8,7 @@ and validate file access within allowed directories.
 import os
 from typing import Optional
 from pathlib import Path
+from py_home_gallery.constants import MEDIA_EXTENSIONS
 
 
 def is_safe_path(base_dir: str, user_path: str, follow_symlinks: bool = False) -> bool:
@@ -111,17 +112,15 @@ def validate_media_extension(filename: str, allowed_extensions: tuple = None) ->
     
     Args:
         filename: The filename to validate
-        allowed_extensions: Tuple of allowed extensions (default: common media types)
+        allowed_extensions: Tuple of allowed extensions (default: MEDIA_EXTENSIONS,
+            the supported image and video types)
         
     Returns:
         bool: True if the extension is allowed, False otherwise
     """
     if allowed_extensions is None:
-        allowed_extensions = (
-            '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp',  # Images
-            '.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv'   # Videos
-        )
-    
-    filename_lower = filename.lower()
-    return any(filename_lower.endswith(ext) for ext in allowed_extensions)
+        allowed_extensions = MEDIA_EXTENSIONS
+
+    # str.endswith checks the whole tuple in C, no generator per call
+    return filename.lower().endswith(tuple(allowed_extensions))
 
@@ -0,0 +1,140 @@
+"""
+Thumbnail post-processing for Py Home Gallery.
+
+This module losslessly recompresses JPEG thumbnails written by ffmpeg with
+jpegoptim, in a background thread so thumbnail requests never wait for it.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import threading
+from typing import Optional
+from py_home_gallery.utils.logger import get_logger
+from py_home_gallery.constants import THUMBNAIL_OPTIMIZE_TIMEOUT, THUMBNAIL_OPTIMIZE_QUEUE_SIZE
+
+logger = get_logger(__name__)
+
+# Pending thumbnail paths; None while post-processing is disabled
+_queue: Optional[queue.Queue] = None
+_thread: Optional[threading.Thread] = None
+
+
+def setup_thumbnail_optimizer(enabled: bool = False) -> None:
+    """
+    Start the background thread that optimizes new thumbnails.
+
+    Should be called once during application startup with config values.
+    When jpegoptim is not installed this logs a warning and leaves
+    post-processing disabled.
+
+    Args:
+        enabled: Whether new thumbnails should be optimized
+    """
+    global _queue, _thread
+
+    if not enabled or _queue is not None:
+        return
+
+    if shutil.which('jpegoptim') is None:
+        logger.warning("jpegoptim not found, thumbnails will not be optimized")
+        return
+
+    _queue = queue.Queue(maxsize=THUMBNAIL_OPTIMIZE_QUEUE_SIZE)
+    _thread = threading.Thread(target=_optimize_worker, args=(_queue,),
+                               name="ThumbnailOptimizer", daemon=True)
+    _thread.start()
+    logger.info("Thumbnail optimization enabled (jpegoptim)")
+
+
+def shutdown_thumbnail_optimizer() -> None:
+    """Stop the optimizer thread after the thumbnail it is working on."""
+    global _queue, _thread
+
+    if _queue is None:
+        return
+
+    pending, _queue = _queue, None
+    try:
+        pending.put_nowait(None)  # Poison pill
+    except queue.Full:
+        pass
+    if _thread is not None:
+        _thread.join(timeout=THUMBNAIL_OPTIMIZE_TIMEOUT)
+        _thread = None
+
+
+def optimize_thumbnail(thumbnail_path: str) -> None:
+    """
+    Queue a freshly written JPEG thumbnail for optimization.
+
+    Does nothing when post-processing is disabled. If the queue is full
+    (e.g. during a large preload) the thumbnail is skipped; it is still a
+    valid, just slightly larger, file.
+
+    Args:
+        thumbnail_path: Path of the thumbnail to optimize
+    """
+    pending = _queue
+    if pending is None:
+        return
+
+    try:
+        pending.put_nowait(thumbnail_path)
+    except queue.Full:
+        logger.debug(f"Optimizer queue full, skipping: {thumbnail_path}")
+
+
+def _optimize_worker(pending: queue.Queue) -> None:
+    """
+    Optimizer thread main loop.
+
+    Args:
+        pending: Queue of thumbnail paths (None stops the thread)
+    """
+    while True:
+        thumbnail_path = pending.get()
+        if thumbnail_path is None:
+            break
+        _run_jpegoptim(thumbnail_path)
+
+
+def _run_jpegoptim(thumbnail_path: str) -> bool:
+    """
+    Recompress one thumbnail in place with jpegoptim.
+
+    Huffman tables are optimized, the file is made progressive and metadata
+    is stripped; pixels are unchanged. jpegoptim writes a temporary file and
+    renames it, so a concurrent reader never sees a partial thumbnail.
+
+    Args:
+        thumbnail_path: Path of the thumbnail to optimize
+
+    Returns:
+        bool: True if jpegoptim ran successfully, False otherwise
+    """
+    try:
+        size_before = os.path.getsize(thumbnail_path)
+        result = subprocess.run(
+            ['jpegoptim', '--quiet', '--strip-all', '--all-progressive', thumbnail_path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=THUMBNAIL_OPTIMIZE_TIMEOUT,
+            check=False
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"jpegoptim failed for {thumbnail_path}: {e}")
+        return False
+
+    if result.returncode != 0:
+        stderr = result.stderr.decode('utf-8', errors='replace').strip()
+        logger.warning(f"jpegoptim exited with {result.returncode} for {thumbnail_path}: {stderr}")
+        return False
+
+    try:
+        logger.debug(f"Optimized thumbnail {thumbnail_path}: "
+                     f"{size_before} -> {os.path.getsize(thumbnail_path)} bytes")
+    except OSError:
+        pass
+    return True
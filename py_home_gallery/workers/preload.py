@@ -7,14 +7,35 @@ when the server starts.
 
 import os
 import threading
-from typing import List, Tuple
+from typing import List, Set, Tuple
 from py_home_gallery.media.scanner import scan_directory
 from py_home_gallery.workers.thumbnail_worker import get_thumbnail_worker
+from py_home_gallery.media.utils import get_thumbnail_path, find_thumbnail, _walk_thumbnail_files
 from py_home_gallery.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _list_existing_thumbnails(thumbnail_dir: str) -> Set[str]:
+    """
+    Get the paths of all non-empty thumbnails below the thumbnail directory.
+
+    Covers both the sharded subdirectories and legacy thumbnails stored
+    directly in the thumbnail directory.
+
+    Args:
+        thumbnail_dir: Directory where thumbnails are stored
+
+    Returns:
+        Set[str]: Full paths of existing thumbnails
+    """
+    root_prefix = os.path.join(thumbnail_dir, '')
+    return {
+        root_prefix + relative_path.replace('/', os.sep)
+        for relative_path in _walk_thumbnail_files(thumbnail_dir, skip_empty=True)
+    }
+
+
 def preload_thumbnails(media_root: str, thumbnail_dir: str, num_threads: int = 2) -> None:
     """
     Preload thumbnails for all videos in the media directory.
@@ -38,10 +59,7 @@ def preload_thumbnails(media_root: str, thumbnail_dir: str, num_threads: int = 2
             media_files = scan_directory(media_root, use_cache=True, include_dimensions=False)
             
             # Filter video files
-            video_files = [
-                item for item in media_files
-                if item['path'].lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv'))
-            ]
+            video_files = [item for item in media_files if item['media_type'] == 'video']
             
             logger.info(f"Found {len(video_files)} video files")
             
@@ -52,27 +70,27 @@ def preload_thumbnails(media_root: str, thumbnail_dir: str, num_threads: int = 2
             # Get the thumbnail worker
             worker = get_thumbnail_worker(num_threads=num_threads)
             
+            # List existing thumbnails once instead of stat-ing a path per video
+            existing_thumbnails = _list_existing_thumbnails(thumbnail_dir)
+
             # Prepare list of videos that need thumbnails
             videos_to_process = []
             skipped = 0
 
+            # Scanned paths are relative to media_root, so full paths are a
+            # plain concatenation (no os.path.join per video)
+            root_prefix = os.path.join(media_root, '')
+
             for video_item in video_files:
                 video_path = video_item['path']
                 # Construct full paths
-                full_video_path = os.path.join(media_root, video_path)
-
-                # Generate thumbnail filename
-                safe_filename = video_path.replace('\\', '_').replace('/', '_')
-                if len(safe_filename) > 200:
-                    import hashlib
-                    file_hash = hashlib.md5(safe_filename.encode()).hexdigest()
-                    extension = os.path.splitext(safe_filename)[1]
-                    safe_filename = f"{file_hash}{extension}"
+                full_video_path = root_prefix + video_path
 
-                thumbnail_path = os.path.join(thumbnail_dir, f"{safe_filename}.png")
+                thumbnail_path = get_thumbnail_path(thumbnail_dir, video_path)
 
-                # Check if thumbnail already exists
-                if os.path.exists(thumbnail_path) and os.path.getsize(thumbnail_path) > 0:
+                # Check if thumbnail already exists (find_thumbnail moves legacy
+                # flat thumbnails into their shard along the way)
+                if thumbnail_path in existing_thumbnails or find_thumbnail(thumbnail_dir, video_path):
                     skipped += 1
                     logger.debug(f"Thumbnail exists, skipping: {video_path}")
                     continue
@@ -5,12 +5,14 @@ This module provides a worker thread pool for generating video thumbnails
 in the background without blocking the main application thread.
 """
 
+import itertools
 import threading
 import queue
 import time
 from typing import Optional, Callable
-from py_home_gallery.media.thumbnails import generate_video_thumbnail
+from py_home_gallery.media.thumbnails import generate_thumbnail
 from py_home_gallery.utils.logger import get_logger
+from py_home_gallery.constants import WORKER_PRIORITY_ON_DEMAND, WORKER_PRIORITY_PRELOAD
 
 logger = get_logger(__name__)
 
@@ -21,11 +23,15 @@ class ThumbnailWorker:
     
     Uses a thread pool to generate thumbnails asynchronously,
     preventing the main thread from blocking during video processing.
+    Jobs run in priority order (lower first, FIFO within a priority), so
+    thumbnails requested by a page jump ahead of the preload backlog.
+    Only background jobs count against the queue size limit, so a full
+    preload backlog never turns away a thumbnail a page is waiting on.
     
     Example:
         >>> worker = ThumbnailWorker(num_threads=2)
         >>> worker.start()
-        >>> worker.add_job('/path/to/video.mp4', '/path/to/thumb.png')
+        >>> worker.add_job('/path/to/video.mp4', '/path/to/thumb.jpg')
         >>> worker.wait_completion()
         >>> worker.stop()
     """
@@ -36,10 +42,18 @@ class ThumbnailWorker:
 
         Args:
             num_threads: Number of worker threads (default: 2)
-            max_queue_size: Maximum queue size (default: 500)
+            max_queue_size: Maximum number of queued background (lower than
+                on-demand priority) jobs (default: 500)
         """
         self.num_threads = num_threads
-        self.job_queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        # Entries are (priority, sequence, job); job is None for a poison pill.
+        # The queue itself is unbounded: background jobs take one of
+        # max_queue_size slots instead, released once they have run, while
+        # on-demand jobs are always accepted
+        self.job_queue: queue.PriorityQueue = queue.PriorityQueue()
+        self.max_queue_size = max_queue_size
+        self._background_slots = threading.Semaphore(max_queue_size)
+        self._sequence = itertools.count()
         self.threads = []
         self.running = False
         self.stats = {
@@ -48,6 +62,10 @@ class ThumbnailWorker:
             'jobs_pending': 0
         }
         self.stats_lock = threading.Lock()
+        # Thumbnail paths queued or being generated, with the best priority
+        # they were queued at (guarded by stats_lock), so repeated requests
+        # for one missing thumbnail queue it only once
+        self.pending_paths = {}
         
         logger.info(f"ThumbnailWorker initialized with {num_threads} threads")
     
@@ -59,19 +77,19 @@ class ThumbnailWorker:
         while self.running:
             try:
                 # Get job from queue with timeout
-                job = self.job_queue.get(timeout=1)
+                _, _, job = self.job_queue.get(timeout=1)
                 
                 if job is None:  # Poison pill to stop thread
                     break
                 
-                video_path, thumbnail_path, callback = job
+                video_path, thumbnail_path, callback, holds_slot = job
                 
                 logger.info(f"[{thread_name}] Processing: {video_path}")
                 start_time = time.time()
                 
                 try:
-                    # Generate thumbnail
-                    success = generate_video_thumbnail(video_path, thumbnail_path)
+                    # Generate thumbnail (waits instead if a request is already generating it)
+                    success = generate_thumbnail(video_path, thumbnail_path)
                     duration = time.time() - start_time
                     
                     if success:
@@ -108,8 +126,11 @@ class ThumbnailWorker:
                             logger.error(f"Callback error: {e}")
                 
                 finally:
+                    if holds_slot:
+                        self._background_slots.release()
                     self.job_queue.task_done()
                     with self.stats_lock:
+                        self.pending_paths.pop(thumbnail_path, None)
                         self.stats['jobs_pending'] = self.job_queue.qsize()
             
             except queue.Empty:
@@ -154,10 +175,7 @@ class ThumbnailWorker:
         
         # Send poison pills to stop threads
         for _ in range(self.num_threads):
-            try:
-                self.job_queue.put(None, block=False)
-            except queue.Full:
-                pass
+            self.job_queue.put((-1, next(self._sequence), None))
         
         if wait:
             # Wait for all threads to finish
@@ -168,33 +186,58 @@ class ThumbnailWorker:
         logger.info("Thumbnail worker stopped")
     
     def add_job(self, video_path: str, thumbnail_path: str,
-                callback: Optional[Callable] = None, timeout: float = 30.0) -> bool:
+                callback: Optional[Callable] = None, timeout: float = 30.0,
+                priority: int = WORKER_PRIORITY_PRELOAD) -> bool:
         """
         Add a thumbnail generation job to the queue.
 
+        A thumbnail that is already queued is not queued again, unless it is
+        now asked for at a higher priority (e.g. a page shows a video the
+        preload has not reached yet); the stale lower-priority job then finds
+        the thumbnail already generated.
+
         Args:
             video_path: Path to the video file
             thumbnail_path: Path where thumbnail should be saved
             callback: Optional callback function(video_path, thumb_path, success)
-            timeout: How long to wait if queue is full (default: 30s)
+            timeout: How long a background job waits for a free queue slot
+                (default: 30s); on-demand jobs never wait
+            priority: Job priority, lower runs first (default: preload priority,
+                use WORKER_PRIORITY_ON_DEMAND for thumbnails a page is waiting on)
 
         Returns:
-            bool: True if job was added, False if timeout waiting for queue space
+            bool: True if job was added (or the thumbnail is already queued),
+            False if timeout waiting for a queue slot
         """
         if not self.running:
             logger.warning("Worker not running, cannot add job")
             return False
 
-        try:
-            # Block and wait up to timeout seconds if queue is full
-            self.job_queue.put((video_path, thumbnail_path, callback), block=True, timeout=timeout)
+        with self.stats_lock:
+            queued_priority = self.pending_paths.get(thumbnail_path)
+            if queued_priority is not None and queued_priority <= priority:
+                logger.debug(f"Job already queued: {video_path}")
+                return True
+            self.pending_paths[thumbnail_path] = priority
+
+        holds_slot = priority > WORKER_PRIORITY_ON_DEMAND
+        # Block and wait up to timeout seconds if the background slots are taken
+        if holds_slot and not self._background_slots.acquire(timeout=timeout):
             with self.stats_lock:
-                self.stats['jobs_pending'] = self.job_queue.qsize()
-            logger.debug(f"Job added: {video_path}")
-            return True
-        except queue.Full:
+                if queued_priority is None:
+                    self.pending_paths.pop(thumbnail_path, None)
+                else:
+                    # Still queued at its original priority
+                    self.pending_paths[thumbnail_path] = queued_priority
             logger.error(f"Job queue full after {timeout}s timeout, cannot add: {video_path}")
             return False
+
+        self.job_queue.put((priority, next(self._sequence),
+                            (video_path, thumbnail_path, callback, holds_slot)))
+        with self.stats_lock:
+            self.stats['jobs_pending'] = self.job_queue.qsize()
+        logger.debug(f"Job added: {video_path}")
+        return True
     
     def wait_completion(self, timeout: Optional[float] = None) -> bool:
         """
@@ -248,8 +291,13 @@ class ThumbnailWorker:
         count = 0
         try:
             while True:
-                self.job_queue.get_nowait()
+                _, _, job = self.job_queue.get_nowait()
                 self.job_queue.task_done()
+                if job is not None:
+                    if job[3]:
+                        self._background_slots.release()
+                    with self.stats_lock:
+                        self.pending_paths.pop(job[1], None)
                 count += 1
         except queue.Empty:
             pass
@@ -0,0 +1,30 @@
+"""
+Shared fixtures for the py_home_gallery tests.
+"""
+
+import pytest
+from PIL import Image
+
+from py_home_gallery.app import create_app
+from py_home_gallery.config import Config
+
+
+@pytest.fixture
+def make_client(tmp_path):
+    """Return a factory for test clients of a gallery with one image."""
+    def _client(*extra_args):
+        media_dir = tmp_path / 'media'
+        media_dir.mkdir(exist_ok=True)
+        Image.new('RGB', (40, 30), (200, 0, 0)).save(media_dir / 'photo.jpg')
+
+        config = Config()
+        config.load_from_args([
+            '--media-dir', str(media_dir),
+            '--thumbnail-dir', str(tmp_path / 'thumbnails'),
+            '--log-dir', str(tmp_path / 'logs'),
+            '--no-worker', '--skip-ffmpeg-check', '--no-log-file',
+            *extra_args,
+        ])
+        return create_app(config).test_client()
+
+    return _client
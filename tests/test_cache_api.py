@@ -0,0 +1,27 @@
+"""
+Tests for the cache clearing endpoint in py_home_gallery.routes.gallery.
+"""
+
+from py_home_gallery.media import scanner
+from py_home_gallery.utils.cache import get_directory_cache
+
+
+def test_clear_cache_drops_scan_caches(make_client):
+    client = make_client()
+    scanner.clear_scan_cache()
+
+    response = client.get('/gallery')
+    assert response.status_code == 200
+    assert b'photo.jpg' in response.get_data()
+    assert get_directory_cache().get_stats()['size'] > 0
+    assert scanner._scan_snapshots
+    assert scanner._subfolder_cache
+
+    response = client.post('/api/cache/clear')
+
+    assert response.status_code == 200
+    assert response.get_json() == {'success': True}
+    assert get_directory_cache().get_stats()['size'] == 0
+    assert not scanner._scan_snapshots
+    assert not scanner._subfolder_cache
+    assert not scanner._basename_indexes
@@ -0,0 +1,65 @@
+"""
+Tests for command-line handling in py_home_gallery.config.
+"""
+
+import pytest
+
+from py_home_gallery.config import Config, _NO_ARGS, _env_bool
+
+
+class TestNoArgs:
+    """The shortcut used when starting without command-line arguments."""
+
+    def test_matches_empty_command_line(self):
+        Config.invalidate_cache()
+        parser = Config()._create_arg_parser()
+
+        assert vars(parser.parse_args([])) == vars(_NO_ARGS)
+
+    def test_load_without_arguments(self):
+        config = Config()
+        config.load_from_args([])
+
+        assert config.skip_ffmpeg_check is False
+        assert config.cache_enabled is True
+        assert config.worker_enabled is True
+
+
+class TestEnvironmentCache:
+    """Environment values are frozen until the cache is invalidated."""
+
+    def test_env_change_needs_invalidate(self, monkeypatch):
+        monkeypatch.setenv('PY_HOME_GALLERY_PORT', '8123')
+        Config.invalidate_cache()
+        assert Config().port == 8123
+
+        monkeypatch.setenv('PY_HOME_GALLERY_PORT', '9123')
+        assert Config().port == 8123
+
+        Config.invalidate_cache()
+        assert Config().port == 9123
+
+        monkeypatch.undo()
+        Config.invalidate_cache()
+
+
+class TestEnvBool:
+    """Spellings accepted for boolean environment variables."""
+
+    @pytest.mark.parametrize('value', ['true', 'True', 'TRUE', '1', 'yes', 'YES', 'on', 'On', ' true ', 'yes\n'])
+    def test_truthy(self, value):
+        assert _env_bool(value) is True
+
+    @pytest.mark.parametrize('value', ['false', '0', 'no', 'off', 'enabled', 'y'])
+    def test_falsy(self, value):
+        assert _env_bool(value) is False
+
+    @pytest.mark.parametrize('value', ['', '  '])
+    def test_blank_keeps_default(self, monkeypatch, value):
+        monkeypatch.setenv('PY_HOME_GALLERY_CACHE_ENABLED', value)
+        Config.invalidate_cache()
+        try:
+            assert Config().cache_enabled is True
+        finally:
+            monkeypatch.undo()
+            Config.invalidate_cache()
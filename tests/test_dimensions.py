@@ -0,0 +1,91 @@
+"""
+Tests for header parsing in py_home_gallery.media.dimensions.
+
+Images are built with PIL in tmp_path, so no binary fixtures are needed.
+"""
+
+import io
+import struct
+
+import pytest
+from PIL import Image
+
+from py_home_gallery.media.dimensions import _read_header_dimensions, get_image_dimensions
+
+SIZE = (37, 23)
+
+
+def _encode(fmt, mode='RGB', color='red', **params):
+    buffer = io.BytesIO()
+    Image.new(mode, SIZE, color).save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+
+def _top_down_bmp():
+    data = bytearray(_encode('BMP'))
+    width, height = struct.unpack('<ii', data[18:26])
+    data[18:26] = struct.pack('<ii', width, -height)
+    return bytes(data)
+
+
+def _os2_bmp():
+    width, height = SIZE
+    row = bytes(3 * width) + bytes(-3 * width % 4)
+    pixels = row * height
+    offset = 14 + 12
+    file_header = b'BM' + struct.pack('<IHHI', offset + len(pixels), 0, 0, offset)
+    core_header = struct.pack('<IHHHH', 12, width, height, 1, 24)
+    return file_header + core_header + pixels
+
+
+IMAGES = {
+    'png': lambda: _encode('PNG'),
+    'gif': lambda: _encode('GIF'),
+    'jpeg': lambda: _encode('JPEG'),
+    'progressive-jpeg': lambda: _encode('JPEG', progressive=True),
+    'bmp': lambda: _encode('BMP'),
+    'top-down-bmp': _top_down_bmp,
+    'os2-bmp': _os2_bmp,
+    'webp-vp8': lambda: _encode('WEBP'),
+    'webp-vp8l': lambda: _encode('WEBP', lossless=True),
+    # Translucent pixels need an alpha chunk, so the extended layout is used
+    'webp-vp8x': lambda: _encode('WEBP', mode='RGBA', color=(255, 0, 0, 128)),
+}
+
+
+class TestHeaderDimensions:
+    """Sizes parsed from headers match what PIL reports."""
+
+    @pytest.mark.parametrize('name', IMAGES)
+    def test_header_matches_pil(self, tmp_path, name):
+        path = tmp_path / 'image'
+        path.write_bytes(IMAGES[name]())
+        with Image.open(path) as img:
+            expected = img.size
+
+        assert _read_header_dimensions(str(path)) == expected
+        assert get_image_dimensions(str(path)) == expected
+
+    def test_webp_chunk_types_are_covered(self):
+        chunks = {name: IMAGES[name]()[12:16] for name in ('webp-vp8', 'webp-vp8l', 'webp-vp8x')}
+
+        assert chunks == {'webp-vp8': b'VP8 ', 'webp-vp8l': b'VP8L', 'webp-vp8x': b'VP8X'}
+
+
+class TestBrokenHeaders:
+    """Unparseable headers give no size instead of a wrong one."""
+
+    @pytest.mark.parametrize('name', ['png', 'gif', 'jpeg', 'bmp', 'webp-vp8x'])
+    def test_truncated_file(self, tmp_path, name):
+        path = tmp_path / 'image'
+        path.write_bytes(IMAGES[name]()[:8])
+
+        assert get_image_dimensions(str(path)) is None
+
+    def test_jpeg_scan_before_frame_header(self, tmp_path):
+        path = tmp_path / 'image.jpg'
+        # SOI, then a start of scan without any SOF marker before it
+        path.write_bytes(b'\xff\xd8' + b'\xff\xda' + struct.pack('>H', 8) + bytes(6) + b'\xff\xd9')
+
+        assert _read_header_dimensions(str(path)) is None
+        assert get_image_dimensions(str(path)) is None
@@ -0,0 +1,52 @@
+"""
+Tests for the ffprobe result memo in py_home_gallery.utils.ffmpeg.
+"""
+
+import json
+import subprocess
+
+import pytest
+
+from py_home_gallery.utils import ffmpeg
+
+
+@pytest.fixture
+def fake_ffprobe(monkeypatch):
+    """Replace ffprobe with a stub that fails until ``ok`` is set."""
+    calls = []
+    state = {'ok': False}
+
+    def fake_run(args, **kwargs):
+        calls.append(args)
+        if not state['ok']:
+            return subprocess.CompletedProcess(args, 1, stdout=b'')
+        info = {'format': {'duration': '12.5'}, 'streams': [{'width': 640, 'height': 360}]}
+        return subprocess.CompletedProcess(args, 0, stdout=json.dumps(info).encode())
+
+    monkeypatch.setattr(ffmpeg.subprocess, 'run', fake_run)
+    monkeypatch.setattr(ffmpeg, '_probe_results', {})
+    return calls, state
+
+
+class TestProbeMemo:
+    """Only successful probes are memoized."""
+
+    def test_failed_probe_is_retried(self, tmp_path, fake_ffprobe):
+        calls, state = fake_ffprobe
+        video = tmp_path / 'clip.mp4'
+        video.write_bytes(b'not yet complete')
+
+        assert ffmpeg._probe_file(str(video)) == (None, None, None)
+        state['ok'] = True
+        assert ffmpeg._probe_file(str(video)) == (12.5, 640, 360)
+        assert len(calls) == 2
+
+    def test_successful_probe_is_memoized(self, tmp_path, fake_ffprobe):
+        calls, state = fake_ffprobe
+        state['ok'] = True
+        video = tmp_path / 'clip.mp4'
+        video.write_bytes(b'video')
+
+        assert ffmpeg._probe_file(str(video)) == (12.5, 640, 360)
+        assert ffmpeg._probe_file(str(video)) == (12.5, 640, 360)
+        assert len(calls) == 1
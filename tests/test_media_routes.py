@@ -0,0 +1,28 @@
+"""
+Tests for the media and thumbnail routes in py_home_gallery.routes.media.
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize('extra_args', [(), ('--no-serve-media',)])
+def test_files_are_streamed_without_x_accel(make_client, extra_args):
+    client = make_client(*extra_args)
+
+    for url in ('/media/photo.jpg', '/thumbnail/photo.jpg'):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert 'X-Accel-Redirect' not in response.headers
+        assert response.get_data()[:2] == b'\xff\xd8'  # JPEG data
+
+
+def test_x_accel_hands_files_to_nginx(make_client):
+    client = make_client('--no-serve-media', '--x-accel')
+
+    response = client.get('/media/photo.jpg')
+    assert response.headers['X-Accel-Redirect'] == '/_media/photo.jpg'
+    assert response.get_data() == b''
+
+    response = client.get('/thumbnail/photo.jpg')
+    assert response.headers['X-Accel-Redirect'].startswith('/_thumbnails/')
+    assert response.get_data() == b''
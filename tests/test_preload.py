@@ -0,0 +1,24 @@
+"""
+Tests for the existing-thumbnail listing used by the startup preload.
+"""
+
+import os
+
+from py_home_gallery.media.utils import get_thumbnail_path
+from py_home_gallery.workers.preload import _list_existing_thumbnails
+
+
+class TestListExistingThumbnails:
+    """Existing thumbnails are listed under the paths preload looks up."""
+
+    def test_lists_sharded_thumbnails_and_skips_empty_files(self, tmp_path):
+        thumbnail_dir = str(tmp_path)
+        done = get_thumbnail_path(thumbnail_dir, 'done.mp4')
+        empty = get_thumbnail_path(thumbnail_dir, 'empty.mp4')
+        for path, data in ((done, b'jpeg'), (empty, b'')):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+        (tmp_path / 'probe_cache.sqlite3').write_bytes(b'db')
+
+        assert _list_existing_thumbnails(thumbnail_dir) == {done}
@@ -0,0 +1,58 @@
+"""
+Tests for the reservoir sampling behind the random gallery.
+"""
+
+import random
+
+import pytest
+
+from py_home_gallery.routes.gallery import _sample_media
+
+
+def _items(images, videos):
+    return ([{'path': f'img{i}.jpg', 'media_type': 'image'} for i in range(images)] +
+            [{'path': f'vid{i}.mp4', 'media_type': 'video'} for i in range(videos)])
+
+
+@pytest.fixture(autouse=True)
+def _seeded():
+    """Make every sample reproducible."""
+    state = random.getstate()
+    random.seed(1234)
+    yield
+    random.setstate(state)
+
+
+class TestSampleMedia:
+    """Sample size, uniqueness and counts of _sample_media."""
+
+    def test_sample_has_requested_size_and_unique_items(self):
+        sample, image_count, video_count = _sample_media(_items(300, 200), 100)
+
+        assert len(sample) == 100
+        assert len({item['path'] for item in sample}) == 100
+        assert (image_count, video_count) == (300, 200)
+
+    def test_count_larger_than_population_returns_everything(self):
+        items = _items(3, 2)
+
+        sample, image_count, video_count = _sample_media(items, 100)
+
+        assert sorted(item['path'] for item in sample) == sorted(item['path'] for item in items)
+        assert (image_count, video_count) == (3, 2)
+
+    def test_media_type_filter(self):
+        sample, image_count, video_count = _sample_media(_items(50, 50), 20, 'videos')
+
+        assert len(sample) == 20
+        assert all(item['media_type'] == 'video' for item in sample)
+        assert (image_count, video_count) == (0, 50)
+
+    def test_every_item_can_be_picked(self):
+        items = _items(10, 0)
+        picked = set()
+        for _ in range(200):
+            sample, _, _ = _sample_media(items, 3)
+            picked.update(item['path'] for item in sample)
+
+        assert picked == {item['path'] for item in items}
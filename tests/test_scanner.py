@@ -0,0 +1,62 @@
+"""
+Tests for incremental rescans in py_home_gallery.media.scanner.
+"""
+
+import os
+
+import pytest
+from PIL import Image
+
+from py_home_gallery.media.scanner import clear_scan_cache, scan_directory
+from py_home_gallery.utils.cache import get_directory_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_scan_cache():
+    """Start every test without cached scans or snapshots."""
+    clear_scan_cache()
+    yield
+    clear_scan_cache()
+
+
+def _rewrite_in_place(path, size):
+    """Overwrite an image without touching its directory's mtime."""
+    directory = os.path.dirname(path)
+    dir_stat = os.stat(directory)
+    file_mtime_ns = os.stat(path).st_mtime_ns
+    Image.new('RGB', size).save(path)
+    # Make sure the file's own mtime moves even on coarse-grained filesystems
+    os.utime(path, ns=(file_mtime_ns + 10**9, file_mtime_ns + 10**9))
+    os.utime(directory, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+
+class TestRescan:
+    """Rescans reuse unchanged directories without serving stale items."""
+
+    def test_file_rewritten_in_place_is_rescanned(self, tmp_path):
+        photo = tmp_path / 'album' / 'photo.png'
+        photo.parent.mkdir()
+        Image.new('RGB', (40, 30)).save(photo)
+        directory = str(tmp_path)
+
+        first = scan_directory(directory)
+        assert [(m['path'], m['width'], m['height']) for m in first] == \
+            [(os.path.join('album', 'photo.png'), 40, 30)]
+
+        _rewrite_in_place(str(photo), (64, 48))
+        # Let the cached result expire; the per-directory snapshots stay
+        get_directory_cache().clear()
+
+        second = scan_directory(directory)
+        assert [(m['width'], m['height']) for m in second] == [(64, 48)]
+        assert second[0]['mtime'] == os.stat(photo).st_mtime
+
+    def test_unchanged_file_item_is_reused(self, tmp_path):
+        Image.new('RGB', (40, 30)).save(tmp_path / 'photo.png')
+        directory = str(tmp_path)
+
+        first = scan_directory(directory)
+        get_directory_cache().clear()
+        second = scan_directory(directory)
+
+        assert second[0] is first[0]
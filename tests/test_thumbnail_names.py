@@ -0,0 +1,77 @@
+"""
+Tests for thumbnail file naming and lookup in py_home_gallery.media.utils.
+"""
+
+import hashlib
+import os
+
+import pytest
+
+from py_home_gallery.media.utils import (
+    _get_thumbnail_filename,
+    clear_thumbnail_lookups,
+    find_thumbnail,
+    get_thumbnail_path,
+)
+
+# Longer than the 200 character limit once flattened
+LONG_PATH = 'a' * 210 + '/clip.mp4'
+
+
+@pytest.fixture(autouse=True)
+def _fresh_lookups():
+    """Forget remembered thumbnail locations between tests."""
+    clear_thumbnail_lookups()
+    yield
+    clear_thumbnail_lookups()
+
+
+class TestThumbnailFilename:
+    """Thumbnail names for short and long media paths."""
+
+    def test_short_name_is_flattened(self):
+        assert _get_thumbnail_filename('folder/clip.mp4') == 'folder_clip.mp4.jpg'
+
+    def test_long_name_keeps_thumbnail_extension(self):
+        safe_name = LONG_PATH.replace('/', '_')
+        expected_hash = hashlib.blake2b(safe_name.encode(), digest_size=16).hexdigest()
+
+        assert _get_thumbnail_filename(LONG_PATH) == f'{expected_hash}.mp4.jpg'
+        assert get_thumbnail_path('/thumbs', LONG_PATH).endswith(f'{expected_hash}.mp4.jpg')
+
+    def test_long_legacy_name_matches_old_flat_layout(self):
+        safe_name = LONG_PATH.replace('/', '_')
+        expected_hash = hashlib.md5(safe_name.encode()).hexdigest()
+
+        name = _get_thumbnail_filename(LONG_PATH, legacy=True, extension='.png')
+
+        assert name == f'{expected_hash}.mp4.png'
+
+
+class TestFindThumbnail:
+    """Lookup of new and legacy thumbnails for long media paths."""
+
+    def test_finds_new_long_name_thumbnail(self, tmp_path):
+        thumbnail_dir = str(tmp_path)
+        thumbnail_path = get_thumbnail_path(thumbnail_dir, LONG_PATH)
+        os.makedirs(os.path.dirname(thumbnail_path))
+        with open(thumbnail_path, 'wb') as f:
+            f.write(b'jpeg')
+
+        assert find_thumbnail(thumbnail_dir, LONG_PATH) == thumbnail_path
+
+    def test_migrates_legacy_long_name_thumbnail(self, tmp_path):
+        thumbnail_dir = str(tmp_path)
+        safe_name = LONG_PATH.replace('/', '_')
+        legacy_name = f'{hashlib.md5(safe_name.encode()).hexdigest()}.mp4.png'
+        legacy_path = tmp_path / legacy_name
+        legacy_path.write_bytes(b'png')
+
+        found = find_thumbnail(thumbnail_dir, LONG_PATH)
+
+        assert found is not None
+        assert found.endswith('.mp4.png')
+        assert os.path.dirname(found) != thumbnail_dir  # moved into its shard
+        assert not legacy_path.exists()
+        with open(found, 'rb') as f:
+            assert f.read() == b'png'
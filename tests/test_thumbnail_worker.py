@@ -0,0 +1,66 @@
+"""
+Tests for job scheduling in py_home_gallery.workers.thumbnail_worker.
+"""
+
+import threading
+
+import pytest
+
+from py_home_gallery.constants import WORKER_PRIORITY_ON_DEMAND
+from py_home_gallery.workers import thumbnail_worker
+from py_home_gallery.workers.thumbnail_worker import ThumbnailWorker
+
+
+@pytest.fixture
+def blocked_worker(monkeypatch):
+    """A one-thread worker whose first job blocks until ``release`` is set."""
+    started = threading.Event()
+    release = threading.Event()
+    processed = []
+
+    def fake_generate_thumbnail(media_path, thumbnail_path):
+        processed.append(media_path)
+        started.set()
+        release.wait(5)
+        return True
+
+    monkeypatch.setattr(thumbnail_worker, 'generate_thumbnail', fake_generate_thumbnail)
+    worker = ThumbnailWorker(num_threads=1, max_queue_size=3)
+    worker.start()
+    yield worker, started, release, processed
+    release.set()
+    worker.stop()
+
+
+class TestOnDemandCapacity:
+    """On-demand jobs are accepted even when preload has filled the queue."""
+
+    def test_on_demand_job_accepted_and_run_first(self, blocked_worker):
+        worker, started, release, processed = blocked_worker
+
+        assert worker.add_job('running.mp4', 'running.jpg', timeout=0)
+        assert started.wait(5)
+        assert worker.add_job('preload-1.mp4', 'preload-1.jpg', timeout=0)
+        assert worker.add_job('preload-2.mp4', 'preload-2.jpg', timeout=0)
+        # All preload slots are taken now
+        assert not worker.add_job('preload-3.mp4', 'preload-3.jpg', timeout=0)
+
+        assert worker.add_job('visible.mp4', 'visible.jpg', timeout=0,
+                              priority=WORKER_PRIORITY_ON_DEMAND)
+
+        release.set()
+        worker.wait_completion()
+        assert processed == ['running.mp4', 'visible.mp4', 'preload-1.mp4', 'preload-2.mp4']
+
+    def test_preload_slots_freed_after_jobs_run(self, blocked_worker):
+        worker, started, release, processed = blocked_worker
+
+        for i in range(3):
+            assert worker.add_job(f'{i}.mp4', f'{i}.jpg', timeout=0)
+        release.set()
+        worker.wait_completion()
+
+        for i in range(3, 6):
+            assert worker.add_job(f'{i}.mp4', f'{i}.jpg', timeout=0)
+        worker.wait_completion()
+        assert len(processed) == 6